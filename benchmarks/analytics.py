@@ -0,0 +1,68 @@
+"""
+Benchmark AttendanceAnalytics over a synthetic school year of meetings.
+
+Run from the repository root:
+
+    python -m benchmarks.analytics
+    python -m benchmarks.analytics --students 1000 --groups 40 --days 180
+
+A roster is generated with teacherHelper.tools.synthetic_oncourse, and a
+full year of daily meetings for some of its homerooms with
+teacherHelper.tools.synthetic_zoom. Then everything the highlights sheet
+needs is computed --repeat times, and the best time is reported.
+"""
+import argparse
+from pathlib import Path
+import tempfile
+from time import perf_counter
+
+from teacherHelper import Helper
+from teacherHelper.attendance_analytics import AttendanceAnalytics
+from teacherHelper.tools.synthetic_oncourse import SyntheticOnCourse
+from teacherHelper.tools.synthetic_zoom import synthetic_meeting_set
+
+
+def run_analytics(meeting_set):
+    analytics = AttendanceAnalytics(meeting_set)
+    analytics.top_students()
+    analytics.bottom_students()
+    analytics.best_and_worst_groups()
+    for i in range(len(meeting_set.groups)):
+        analytics.over_time(i)
+    return analytics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--students', type=int, default=200)
+    parser.add_argument('--groups', type=int, default=6)
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = SyntheticOnCourse(args.students, seed=args.seed).write(
+            Path(directory)
+        )
+        helper = Helper.new_school_year(*paths)
+    meeting_set = synthetic_meeting_set(
+        helper,
+        days=args.days,
+        groups=args.groups,
+        seed=args.seed
+    )
+
+    best = float('inf')
+    for _ in range(args.repeat):
+        start = perf_counter()
+        run_analytics(meeting_set)
+        best = min(best, perf_counter() - start)
+
+    rows, columns = meeting_set.attendance.matrix.shape
+    print(f'{columns} meetings in {len(meeting_set.groups)} groups, {rows} students')
+    print(f'    analytics    {best * 1000:8.2f} ms (best of {args.repeat})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark ZoomReportFetcher against the local zoom stub server.
+
+Run from the repository root:
+
+    python -m benchmarks.fetch
+    python -m benchmarks.fetch --reports 200 --latency 0.1 --concurrency 1 4 16
+
+Synthetic reports (teacherHelper.tools.synthetic_zoom) are served by
+teacherHelper.tools.zoom_stub_server with `latency` seconds added to every
+request and every `fail_every`th request failing. For each concurrency, the
+reports are fetched as fast as they can be taken, and then again by a
+consumer that takes `consumer_delay` seconds per report, to show that
+downloads wait for the consumer instead of running ahead of it. Finally,
+the reports are fetched straight into MeetingSet.process.
+"""
+import argparse
+from pathlib import Path
+import tempfile
+from time import perf_counter, sleep
+
+from teacherHelper import Helper
+from teacherHelper.tools.synthetic_oncourse import SyntheticOnCourse
+from teacherHelper.tools.synthetic_zoom import synthetic_reports
+from teacherHelper.tools.zoom_fetcher import ZoomReportFetcher
+from teacherHelper.tools.zoom_stub_server import ZoomStubServer
+from teacherHelper.zoom_attendance_report import HelperConsumer, MeetingSet
+
+
+def run(reports, args, concurrency, consume):
+    with ZoomStubServer(
+            reports,
+            latency=args.latency,
+            fail_every=args.fail_every) as server:
+        fetcher = ZoomReportFetcher(
+            base_url=server.url,
+            concurrency=concurrency,
+            backoff=0.01
+        )
+        start = perf_counter()
+        count = consume(fetcher.iter_reports(server.meeting_ids))
+        seconds = perf_counter() - start
+    return {
+        'reports': count,
+        'seconds': seconds,
+        'requests': server.requests,
+        'retried': fetcher.retried,
+        'in_flight': server.max_in_flight,
+    }
+
+
+def take_all(reports):
+    return sum(1 for _ in reports)
+
+
+def take_slowly(delay):
+    def consume(reports):
+        count = 0
+        for _ in reports:
+            sleep(delay)
+            count += 1
+        return count
+    return consume
+
+
+def process(reports):
+    meeting_set = MeetingSet(reports)
+    return sum(1 for _ in meeting_set.process())
+
+
+def print_row(label, result):
+    print(
+        f'    {label:<22} {result["seconds"]:8.3f}s '
+        f'{result["reports"] / result["seconds"]:9.1f}/s '
+        f'{result["requests"]:>9} {result["retried"]:>8} {result["in_flight"]:>10}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--reports', type=int, default=100)
+    parser.add_argument('--students', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--fail-every', type=int, default=20)
+    parser.add_argument('--consumer-delay', type=float, default=0.05)
+    parser.add_argument(
+        '--concurrency', nargs='+', type=int, default=[1, 2, 4, 8, 16]
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = SyntheticOnCourse(args.students, seed=args.seed).write(
+            Path(directory)
+        )
+        helper = Helper.new_school_year(*paths)
+    HelperConsumer.helper = helper
+    reports = synthetic_reports(helper, args.reports, seed=args.seed)
+
+    print(
+        f'{args.reports} reports, {args.latency * 1000:.0f} ms per request, '
+        f'every {args.fail_every}th request fails'
+    )
+    print(
+        f'    {"":<22} {"time":>9} {"reports":>11} {"requests":>9} '
+        f'{"retried":>8} {"in flight":>10}'
+    )
+    for concurrency in args.concurrency:
+        print_row(
+            f'concurrency {concurrency}',
+            run(reports, args, concurrency, take_all)
+        )
+        print_row(
+            f'  consumer {args.consumer_delay * 1000:.0f} ms/report',
+            run(reports, args, concurrency, take_slowly(args.consumer_delay))
+        )
+    print_row(
+        f'into MeetingSet ({args.concurrency[-1]})',
+        run(reports, args, args.concurrency[-1], process)
+    )
+
+
+if __name__ == '__main__':
+    main()
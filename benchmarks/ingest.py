@@ -0,0 +1,85 @@
+"""
+Benchmark Helper.new_school_year against synthetic OnCourse exports.
+
+Run from the repository root:
+
+    python -m benchmarks.ingest
+    python -m benchmarks.ingest --sizes 1000 10000 --seed 3
+
+For each roster size, this generates the student and guardian csv files
+with teacherHelper.tools.synthetic_oncourse, ingests them once for wall
+time and the per-stage breakdown (helper.ingest_timings), then ingests them
+again under tracemalloc for peak memory, since tracing slows everything
+down.
+"""
+import argparse
+from pathlib import Path
+import tempfile
+from time import perf_counter
+import tracemalloc
+
+from teacherHelper import Helper
+from teacherHelper.tools.synthetic_oncourse import SyntheticOnCourse
+
+
+def bench_size(n_students, seed, directory, measure_memory=True):
+    paths = SyntheticOnCourse(n_students, seed=seed).write(
+        Path(directory, str(n_students))
+    )
+
+    start = perf_counter()
+    helper = Helper.new_school_year(*paths)
+    wall = perf_counter() - start
+    result = {
+        'students': len(helper.students),
+        'wall': wall,
+        'stages': helper.ingest_timings,
+        'peak_mb': None,
+    }
+    del helper
+
+    if measure_memory:
+        tracemalloc.start()
+        Helper.new_school_year(*paths)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['peak_mb'] = peak / 2 ** 20
+    return result
+
+
+def print_result(result):
+    peak = (
+        f'{result["peak_mb"]:.1f} MB' if result['peak_mb'] is not None
+        else 'not measured'
+    )
+    print(f'{result["students"]:>7} students')
+    print(f'    wall time    {result["wall"]:8.3f} s')
+    print(f'    peak memory  {peak}')
+    for stage, seconds in result['stages'].items():
+        print(f'    {stage:<20} {seconds:8.3f} s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--sizes', nargs='+', type=int, default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--no-memory',
+        action='store_true',
+        help='skip the second, traced ingest that measures peak memory'
+    )
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        for n_students in args.sizes:
+            print_result(bench_size(
+                n_students,
+                args.seed,
+                directory,
+                measure_memory=not args.no_memory
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark how fast, and how well, MeetingSet matches zoom names to
+students.
+
+Run from the repository root:
+
+    python -m benchmarks.matching
+    python -m benchmarks.matching --reports 60 --students 500 --seed 2
+
+A roster is generated with teacherHelper.tools.synthetic_oncourse, and
+zoom reports for it with teacherHelper.tools.synthetic_zoom.adversarial_reports,
+where students show up with typos, nicknames, first names only, emoji,
+device names, and their parents' names, alongside a few participants who
+aren't students. Every meeting's matched attendees are checked against who
+was really there: precision is the share of matched students who were
+there, and recall the share of students who were there that were matched.
+Recall is also broken down by the kind of name the student used.
+"""
+import argparse
+from pathlib import Path
+import tempfile
+from time import perf_counter
+
+from teacherHelper import Helper
+from teacherHelper.tools.synthetic_oncourse import SyntheticOnCourse
+from teacherHelper.tools.synthetic_zoom import adversarial_reports
+from teacherHelper.tools.zoom_report_parser import parse_zoom_report
+from teacherHelper.zoom_attendance_report import HelperConsumer, MeetingSet
+
+
+def score(meetings, reports):
+    """
+    (true positives, false positives, false negatives, {kind: [found, of]})
+    over all meetings.
+    """
+    true_positives = false_positives = false_negatives = 0
+    by_kind = {}
+    for meeting, report in zip(meetings, reports):
+        matched = {st.student_id for st in meeting.attendees}
+        there = set(report.attendees)
+        true_positives += len(matched & there)
+        false_positives += len(matched - there)
+        false_negatives += len(there - matched)
+        for student_id, kind in report.attendees.items():
+            found, of = by_kind.get(kind, (0, 0))
+            by_kind[kind] = (found + (student_id in matched), of + 1)
+    return true_positives, false_positives, false_negatives, by_kind
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--reports', type=int, default=30)
+    parser.add_argument('--students', type=int, default=200)
+    parser.add_argument('--groups', type=int, default=6)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--parallel',
+        action='store_true',
+        help='match reports in a process pool (stage times are then summed '
+             'across the workers)'
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = SyntheticOnCourse(args.students, seed=args.seed).write(
+            Path(directory)
+        )
+        helper = Helper.new_school_year(*paths)
+    HelperConsumer.helper = helper
+    reports = adversarial_reports(
+        helper,
+        args.reports,
+        groups=args.groups,
+        seed=args.seed
+    )
+    rows = sum(len(parse_zoom_report(r.csv).participants) for r in reports)
+
+    meeting_set = MeetingSet([r.csv for r in reports])
+    start = perf_counter()
+    for _ in meeting_set.process(parallel=args.parallel):
+        pass
+    seconds = perf_counter() - start
+
+    true_positives, false_positives, false_negatives, by_kind = score(
+        meeting_set.meetings,
+        reports
+    )
+    precision = true_positives / ((true_positives + false_positives) or 1)
+    recall = true_positives / ((true_positives + false_negatives) or 1)
+
+    print(
+        f'{len(reports)} reports, {rows} rows, {len(helper.students)} '
+        f'students in the roster'
+    )
+    print(f'    time         {seconds:8.3f} s')
+    print(f'    rows/sec     {rows / seconds:8.1f}')
+    print(f'    precision    {precision:8.3f}  ({false_positives} wrong)')
+    print(f'    recall       {recall:8.3f}  ({false_negatives} missed)')
+    print('recall by kind of name')
+    for kind, (found, of) in sorted(by_kind.items(), key=lambda k: -k[1][1]):
+        print(f'    {kind:<12} {found / of:8.3f}  ({found} of {of})')
+    print('time by stage')
+    total = sum(meeting_set.read_timings.values())
+    for stage, stage_seconds in meeting_set.read_timings.items():
+        print(
+            f'    {stage:<12} {stage_seconds:8.3f} s  '
+            f'{stage_seconds / total:6.1%}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark the memory a processed MeetingSet holds on to.
+
+Run from the repository root:
+
+    python -m benchmarks.meeting_memory
+    python -m benchmarks.meeting_memory --meetings 2000 --students 400
+
+A roster is generated with teacherHelper.tools.synthetic_oncourse, and zoom
+reports for it with teacherHelper.tools.synthetic_zoom. The reports are
+read and matched under tracemalloc; what is still allocated once they are
+processed and the reports themselves have been dropped is what the
+MeetingSet retains.
+"""
+import argparse
+import gc
+from pathlib import Path
+import tempfile
+from time import perf_counter
+import tracemalloc
+
+from teacherHelper import Helper
+from teacherHelper.tools.synthetic_oncourse import SyntheticOnCourse
+from teacherHelper.tools.synthetic_zoom import synthetic_reports
+from teacherHelper.zoom_attendance_report import HelperConsumer, MeetingSet
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--meetings', type=int, default=500)
+    parser.add_argument('--students', type=int, default=200)
+    parser.add_argument('--groups', type=int, default=6)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = SyntheticOnCourse(args.students, seed=args.seed).write(
+            Path(directory)
+        )
+        helper = Helper.new_school_year(*paths)
+    HelperConsumer.helper = helper
+    reports = synthetic_reports(
+        helper,
+        args.meetings,
+        groups=args.groups,
+        seed=args.seed
+    )
+    report_mb = sum(len(r) for r in reports) / 2 ** 20
+
+    gc.collect()
+    tracemalloc.start()
+    start = perf_counter()
+    meeting_set = MeetingSet(reports)
+    for _ in meeting_set.process():
+        pass
+    seconds = perf_counter() - start
+    meeting_set.csv_strings = None
+    del reports
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f'{len(meeting_set.meetings)} meetings in {len(meeting_set.groups)} '
+        f'groups, {report_mb:.2f} MB of zoom reports'
+    )
+    print(f'    processing time  {seconds:8.3f} s')
+    print(f'    peak memory      {peak / 2 ** 20:8.2f} MB')
+    print(f'    retained memory  {retained / 2 ** 20:8.2f} MB')
+    print(
+        f'    per meeting      '
+        f'{retained / len(meeting_set.meetings) / 2 ** 10:8.2f} KB'
+    )
+
+
+if __name__ == '__main__':
+    main()
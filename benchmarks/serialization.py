@@ -0,0 +1,138 @@
+"""
+Benchmark MeetingSet serialization: the original JSON format, where every
+attendee of every meeting carries their whole attendance report, against
+the columnar format, plain and gzipped, and JSON Lines streamed to a file.
+
+Run from the repository root:
+
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --students 1000 --groups 40 --days 180
+
+A roster is generated with teacherHelper.tools.synthetic_oncourse, and a
+school year of daily meetings with teacherHelper.tools.synthetic_zoom.
+Peak memory is traced while dumping, separately from the timed runs.
+"""
+import argparse
+import json
+from pathlib import Path
+import tempfile
+from time import perf_counter
+import tracemalloc
+
+from teacherHelper import Helper
+from teacherHelper.tools.synthetic_oncourse import SyntheticOnCourse
+from teacherHelper.tools.synthetic_zoom import synthetic_meeting_set
+from teacherHelper.zoom_attendance_report import MeetingSet
+
+
+def original_format(meeting_set):
+    """
+    The JSON MeetingSet.serialize wrote before serialization was versioned.
+    """
+    attendance = meeting_set.attendance
+    return json.dumps([
+        [
+            {
+                'unidentifiable': meeting.unidentifiable,
+                'attendees': [
+                    (s.name, attendance.student_report(s.student_id))
+                    for s in meeting.attendees
+                ],
+                'datetime': meeting.datetime.isoformat(),
+                'topic': meeting.topic,
+                'search_confidence': meeting.SEARCH_CONFIDENCE_THRESHOLD
+            }
+            for meeting in group
+        ]
+        for group in meeting_set.groups
+    ])
+
+
+def timed(func, *a, **kw):
+    start = perf_counter()
+    result = func(*a, **kw)
+    return result, perf_counter() - start
+
+
+def traced(func, *a, **kw):
+    tracemalloc.start()
+    func(*a, **kw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def dump_lines(meeting_set, path):
+    with open(path, 'w') as fp:
+        meeting_set.dump(fp)
+    return path
+
+
+def load_lines(path):
+    with open(path) as fp:
+        return MeetingSet.load(fp)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--students', type=int, default=200)
+    parser.add_argument('--groups', type=int, default=6)
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--skip-original-load',
+        action='store_true',
+        help='do not time loading the original format, which is slow'
+    )
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    paths = SyntheticOnCourse(args.students, seed=args.seed).write(
+        Path(directory.name)
+    )
+    helper = Helper.new_school_year(*paths)
+    meeting_set = synthetic_meeting_set(
+        helper,
+        days=args.days,
+        groups=args.groups,
+        seed=args.seed
+    )
+    print(
+        f'{len(meeting_set.meetings)} meetings in {len(meeting_set.groups)} '
+        f'groups, {len(meeting_set.attendance.student_ids)} students'
+    )
+    print(
+        f'    {"format":<18} {"size":>10} {"dump":>10} {"load":>10} '
+        f'{"dump peak":>10}'
+    )
+
+    jsonl = Path(directory.name, 'meetings.jsonl')
+    formats = [
+        ('original json', original_format, {}, MeetingSet.deserialize_from_string),
+        ('columnar json', MeetingSet.serialize, {}, MeetingSet.deserialize_from_string),
+        (
+            'columnar gzip',
+            MeetingSet.serialize,
+            {'compress': True},
+            MeetingSet.deserialize_from_string
+        ),
+        ('json lines', dump_lines, {'path': jsonl}, load_lines),
+    ]
+    for name, dump, kw, load in formats:
+        data, dump_time = timed(dump, meeting_set, **kw)
+        size = jsonl.stat().st_size if name == 'json lines' else len(data)
+        if name == 'original json' and args.skip_original_load:
+            load_time = 'skipped'
+        else:
+            _, seconds = timed(load, data)
+            load_time = f'{seconds:9.3f}s'
+        peak = traced(dump, meeting_set, **kw)
+        print(
+            f'    {name:<18} {size / 2 ** 20:8.2f}MB '
+            f'{dump_time:9.3f}s {load_time:>10} {peak / 2 ** 20:8.2f}MB'
+        )
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
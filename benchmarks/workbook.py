@@ -0,0 +1,100 @@
+"""
+Benchmark writing a MeetingSet's excel report with WorkbookWriter.
+
+Run from the repository root:
+
+    python -m benchmarks.workbook
+    python -m benchmarks.workbook --students 1000 --groups 40 --days 180
+
+A roster is generated with teacherHelper.tools.synthetic_oncourse, and a
+school year of daily meetings with teacherHelper.tools.synthetic_zoom. The
+report is generated and saved once in each mode for wall time and file
+size, then again under tracemalloc for peak memory, since tracing slows
+everything down.
+
+The inline-styles mode styles every cell with its own font and fill
+instead of the named styles in ReportStyles, to show what the registry
+saves.
+"""
+import argparse
+import gc
+import os
+from pathlib import Path
+import tempfile
+from time import perf_counter
+import tracemalloc
+
+from teacherHelper import Helper
+from teacherHelper.tools.synthetic_oncourse import SyntheticOnCourse
+from teacherHelper.tools.synthetic_zoom import synthetic_meeting_set
+from teacherHelper.zoom_attendance_report import WorkbookWriter
+
+
+MODES = {
+    'normal': {},
+    'write-only': {'write_only': True},
+    'inline-styles': {'named_styles': False},
+}
+
+
+def write_report(meeting_set, path, options):
+    WorkbookWriter(meeting_set, **options).generate_report().save(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--students', type=int, default=400)
+    parser.add_argument('--groups', type=int, default=12)
+    parser.add_argument('--days', type=int, default=180)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--modes', nargs='+', choices=list(MODES), default=list(MODES)
+    )
+    parser.add_argument(
+        '--no-memory',
+        action='store_true',
+        help='skip the second, traced run that measures peak memory'
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = SyntheticOnCourse(args.students, seed=args.seed).write(
+            Path(directory)
+        )
+        helper = Helper.new_school_year(*paths)
+        meeting_set = synthetic_meeting_set(
+            helper,
+            days=args.days,
+            groups=args.groups,
+            seed=args.seed
+        )
+        print(
+            f'{len(meeting_set.meetings)} meetings in '
+            f'{len(meeting_set.groups)} groups, '
+            f'{len(meeting_set.attendance.student_ids)} students'
+        )
+        print(f'    {"mode":<14} {"time":>9} {"peak memory":>12} {"size":>10}')
+        for mode in args.modes:
+            path = Path(directory, f'{mode}.xlsx')
+            gc.collect()
+            start = perf_counter()
+            write_report(meeting_set, path, MODES[mode])
+            seconds = perf_counter() - start
+            size = os.path.getsize(path)
+
+            peak = 'skipped'
+            if not args.no_memory:
+                gc.collect()
+                tracemalloc.start()
+                write_report(meeting_set, path, MODES[mode])
+                _, traced = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                peak = f'{traced / 2 ** 20:9.1f}MB'
+            print(
+                f'    {mode:<14} {seconds:8.2f}s {peak:>12} '
+                f'{size / 2 ** 20:8.2f}MB'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -7,18 +7,27 @@ or use a wrapper script like this one:
 """
 
 import code
+from datetime import date, timedelta
 import os
 from time import sleep
 import sys
 import webbrowser
-import subprocess
 from pathlib import Path
 
 from fuzzywuzzy import process
 
 from teacherHelper import Helper, Email
+from teacherHelper.attendance_archive import AttendanceArchive
+from teacherHelper.tools.zoom_archive import iter_zoom_reports
+from teacherHelper.zoom_aliases import ZoomAliasStore
+from teacherHelper.zoom_attendance_report import HelperConsumer, MeetingSet
 from paychex import Paychex
 
+DATA_DIR = Path(Path(__file__).parent, 'data')
+ZOOM_REPORTS_DIR = Path(DATA_DIR, 'zoom_attendance_reports')
+ATTENDANCE_ARCHIVE = Path(DATA_DIR, 'attendance.sqlite3')
+ZOOM_ALIASES = Path(DATA_DIR, 'zoom_aliases.json')
+
 # TODO: re-implement implement with argparse (https://docs.python.org/3/library/argparse.html)
 
 
@@ -95,41 +104,57 @@ class ShellUtils:
             except IndexError:
                 self.improper_usage()
 
+        # COMMAND "emp phone" => who is calling?
+        elif self.args[1] == 'phone':
+            if len(self.args) < 3:
+                self.improper_usage()
+            self.phone_lookup(''.join(self.args[2:]))
+            sys.exit()
+
+        # COMMAND "emp address" => whose email address is this?
+        elif self.args[1] == 'address':
+            if len(self.args) < 3:
+                self.improper_usage()
+            self.email_lookup(self.args[2])
+            sys.exit()
+
+        # COMMAND "emp birthdays" => upcoming birthdays by homeroom
+        elif self.args[1] == 'birthdays':
+            try:
+                days = int(self.args[2]) if len(self.args) > 2 else None
+            except ValueError:
+                self.improper_usage()
+            self.birthdays(days)
+            sys.exit()
+
         # COMMAND "emp new" => refresh cache from files in ./data dir
         elif self.args[1] == 'new':
             new = Helper.new_school_year(
-                Path(Path(__file__).parent, 'data', 'students.csv'),
-                Path(Path(__file__).parent, 'data', 'parents.csv'),
+                Path(DATA_DIR, 'students.csv'),
+                Path(DATA_DIR, 'parents.csv'),
             )
             new.write_cache()
             print('Cache updated.')
             sys.exit()
 
-        # COMMAND "emp report" => grep for zoom attendance history through
-                                  # downloaded reports
+        # COMMAND "emp report" => zoom attendance history from the archive
         elif self.args[1] == 'report':
-            try:
-                st = self.check_cache().find_nearest_match(
-                    ' '.join([i for i in self.args[2:] if i != '-v']),
-                    auto_yes=True,
-                    threshold=60
-                )
-                print('-' * 30 + 'Contact' + '-' * 30)
-                print(st)
-                print('-' * 30 + 'Zoom Attendance' + '-' * 30)
-                zoom_reports_dir = Path(
-                    Path(__file__).parent, 'data', 'zoom_attendance_reports/'
-                )
-                out = subprocess.call(
-                    [
-                        'grep',
-                        '-nir',
-                        st.first_name.lower(),
-                        zoom_reports_dir.resolve()
-                    ]
-                )
-            except IndexError:
+            if len(self.args) < 3:
                 self.improper_usage()
+            self.attendance_report(
+                ' '.join([i for i in self.args[2:] if i != '-v'])
+            )
+            sys.exit()
+
+        # COMMAND "emp archive" => add downloaded zoom reports to the archive
+        elif self.args[1] == 'archive':
+            self.archive_zoom_reports()
+            sys.exit()
+
+        # COMMAND "emp unidentified" => resolve unidentifiable zoom names
+        elif self.args[1] == 'unidentified':
+            self.resolve_unidentifiable()
+            sys.exit()
         elif self.args[1] == 'email':
             self.email()
         else:
@@ -230,6 +255,130 @@ class ShellUtils:
         )
         return all_guardians.get(name_match[0]).student
 
+    def phone_lookup(self, number):
+        'Print every guardian with this phone number, and their students.'
+        matches = self.helper.lookup_phone(number)
+        if not matches:
+            print(f'No guardian has the phone number {number}')
+            return
+        for guardian, students in matches:
+            print(guardian)
+            print('Students: ' + ', '.join(
+                f'{st.name} ({st.homeroom})' for st in students
+            ))
+            print()
+
+    def email_lookup(self, address):
+        'Print every student or guardian who uses this email address.'
+        matches = self.helper.lookup_email(address)
+        if not matches:
+            print(f'Nobody has the email address {address}')
+            return
+        for entity in matches:
+            print(entity)
+            if (st := getattr(entity, 'student', None)):
+                print(f'Student: {st.name} ({st.homeroom})\n')
+
+    def birthdays(self, days=None):
+        'Print birthdays this week, or in the next [days] days, by homeroom.'
+        if days is None:
+            homerooms = self.helper.birthdays_this_week()
+        else:
+            today = date.today()
+            homerooms = self.helper.birthdays_by_homeroom(
+                today,
+                today + timedelta(days=days)
+            )
+        if not homerooms:
+            print('No birthdays.')
+        for homeroom in sorted(homerooms, key=str):
+            print(homeroom)
+            for st in homerooms[homeroom]:
+                print(f'\t{st.birthday.strftime("%a %b %d")}\t{st.name}')
+
+    def attendance_report(self, name):
+        'Print contact info and a summary of archived zoom attendance.'
+        st = self.helper.find_nearest_match(name, auto_yes=True, threshold=60)
+        if not st:
+            print(f'No student matches {name}')
+            return
+        print('-' * 30 + 'Contact' + '-' * 30)
+        print(st)
+        print('-' * 30 + 'Zoom Attendance' + '-' * 30)
+        if not ATTENDANCE_ARCHIVE.exists():
+            print('There is no attendance archive yet. Run "archive" first.')
+            return
+        with AttendanceArchive(ATTENDANCE_ARCHIVE) as archive:
+            summary = archive.student_summary(st.student_id)
+        if not summary:
+            print(f'{st.name} has not attended any archived zoom meetings.')
+            return
+        print(
+            f'{summary.meetings} meetings from {summary.first[:10]} to '
+            f'{summary.last[:10]}; {summary.total_minutes} minutes in all, '
+            f'{summary.average_minutes:.0f} on average. Joined '
+            f'{summary.connections} times.'
+        )
+        for topic, meetings, average in summary.topics:
+            print(f'\t{topic}: {meetings} meetings, {average:.0f} minutes on average')
+        print('Most recent:')
+        for start, topic, minutes in summary.recent:
+            print(f'\t{start[:16].replace("T", " ")}\t{topic}\t{minutes} minutes')
+
+    def archive_zoom_reports(self):
+        'Match the zoom reports in ./data and add them to the archive.'
+        HelperConsumer.helper = self.helper
+        meeting_set = MeetingSet(
+            iter_zoom_reports(ZOOM_REPORTS_DIR),
+            aliases=ZoomAliasStore(ZOOM_ALIASES)
+        )
+        for meeting in meeting_set.process():
+            print(f'Read {meeting}')
+        with AttendanceArchive(ATTENDANCE_ARCHIVE) as archive:
+            added = archive.add_meeting_set(meeting_set)
+        print(
+            f'Archived {added} new meetings from '
+            f'{len(meeting_set.meetings)} reports.'
+        )
+
+    def resolve_unidentifiable(self):
+        'Ask who each cluster of unidentifiable zoom names is, and save it.'
+        HelperConsumer.helper = self.helper
+        aliases = ZoomAliasStore(ZOOM_ALIASES)
+        meeting_set = MeetingSet(
+            iter_zoom_reports(ZOOM_REPORTS_DIR),
+            aliases=aliases
+        )
+        for meeting in meeting_set.process():
+            print(f'Read {meeting}')
+        clusters = meeting_set.unidentifiable_clusters()
+        print(f'{len(clusters)} groups of zoom names could not be identified.')
+        for cluster in clusters:
+            topics = sorted({m.topic for m in cluster.meetings})
+            print('\n' + ', '.join(cluster.names))
+            print(
+                f'\tin {len(cluster.meetings)} meetings '
+                f'({", ".join(topics)}), groups {cluster.groups}'
+            )
+            name = input(
+                'Who is this? Student name, "-" if not a student, or enter '
+                'to skip: '
+            ).strip()
+            if not name:
+                continue
+            if name == '-':
+                st = None
+            else:
+                st = self.helper.find_nearest_match(
+                    name,
+                    auto_yes=True,
+                    threshold=60
+                )
+                if not st or not self._confirm(f'{st.name}? (y/n) '):
+                    continue
+            aliases.resolve(cluster, st)
+            aliases.save()
+
     def student_search(self, name, verbose=False):
         'Search for student, print basic student info.'
         return self.check_cache().find_nearest_match(
@@ -295,9 +444,33 @@ class ShellUtils:
             lower confidence will be returned over a better match against a
             secondary contact.
 
+        phone [phone number]
+            Prints the guardian(s) with this mobile, home, or work phone
+            number, along with their students. Any formatting is fine.
+
+        address [email address]
+            Prints the student(s) or guardian(s) who use this email
+            address. Pass only the part before the "@" to search by that.
+
+        birthdays [days]
+            Prints students with a birthday this week, by homeroom. If days
+            is given, prints birthdays from today through that many days
+            from now instead.
+
         report [student name]
-            Print a report for the student that includes zoom attendance
-            record.
+            Print a report for the student that includes a summary of their
+            zoom attendance, from the attendance archive.
+
+        archive
+            Read the zoom reports in ./data/zoom_attendance_reports (csv
+            files, or zip / tar / gzip archives of them) and add them to the
+            attendance archive at ./data/attendance.sqlite3.
+
+        unidentified
+            Read the same zoom reports, and go through the names that could
+            not be matched to a student, grouped with similar names. Each
+            group is resolved to a student (or to nobody) at once, and saved
+            to ./data/zoom_aliases.json, which "archive" uses from then on.
 
         clock
             Automatically clocks in or out of Paychex, depending on time of day
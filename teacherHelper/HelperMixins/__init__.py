@@ -1,2 +1,3 @@
 from .oncourse_mixin import OnCourseMixin
 from .silly import SillyMixin
+from .lookup import LookupMixin
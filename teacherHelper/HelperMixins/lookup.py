@@ -0,0 +1,194 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+import re
+
+PHONE_FIELDS = ['mobile_phone', 'home_phone', 'work_phone']
+NON_DIGITS = re.compile(r'\D')
+
+
+def normalize_phone(number):
+    """
+    Reduce a phone number (int or any formatted string) to a 10 digit int,
+    dropping a leading US country code. Returns None for anything that is
+    not a complete phone number.
+    """
+    if number is None:
+        return None
+    if isinstance(number, int):
+        digits = str(number)  # already cleaned by new_school_year
+    else:
+        digits = NON_DIGITS.sub('', number)
+    if len(digits) == 11 and digits.startswith('1'):
+        digits = digits[1:]
+    if len(digits) != 10:
+        return None
+    return int(digits)
+
+
+def month_day(d):
+    """
+    Sort key for a birthday that ignores the year; March 4th is 304.
+    """
+    return d.month * 100 + d.day
+
+
+def years_before(d, years):
+    try:
+        return d.replace(year=d.year - years)
+    except ValueError:  # February 29th
+        return d.replace(year=d.year - years, day=28)
+
+
+class LookupMixin:
+    """
+    Reverse lookups over the roster. The indexes are built at the end of
+    new_school_year and are persisted along with everything else by
+    write_cache. A helper from an older cache does not have them, so they
+    are built on first use instead.
+    """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def build_indexes(self):
+        self.build_phone_index()
+        self.build_email_index()
+        self.build_birthday_index()
+
+    def build_phone_index(self):
+        """
+        self.phone_index maps each normalized phone number to a list of
+        (guardian, students) tuples. There is a ParentGuardian instance for
+        every student the guardian is attached to, so records are merged by
+        guardian name and the students of a sibling household are listed
+        together.
+        """
+        index = {}
+        for student in self.students.values():
+            for guardian in student.guardians:
+                for field in PHONE_FIELDS:
+                    phone = normalize_phone(getattr(guardian, field))
+                    if phone is None:
+                        continue
+                    household = index.setdefault(phone, {})
+                    _, students = household.setdefault(
+                        guardian.name,
+                        (guardian, [])
+                    )
+                    if student not in students:
+                        students.append(student)
+        self.phone_index = {
+            phone: list(household.values())
+            for phone, household in index.items()
+        }
+
+    def lookup_phone(self, number):
+        """
+        Returns a list of (guardian, students) tuples for every guardian
+        who has this phone number, or an empty list.
+        """
+        if getattr(self, 'phone_index', None) is None:
+            self.build_phone_index()
+        return self.phone_index.get(normalize_phone(number), [])
+
+    def build_email_index(self):
+        """
+        self.email_index maps each casefolded email address to a list of
+        the students and guardians that use it. self.email_local_index does
+        the same for the part before the "@", which is what shows up when a
+        zoom name is really an email handle.
+        """
+        index = {}
+        local_index = {}
+        for student in self.students.values():
+            for entity in [student] + student.guardians:
+                if not entity.email or '@' not in entity.email:
+                    continue
+                address = entity.email.strip().casefold()
+                index.setdefault(address, []).append(entity)
+                local_index.setdefault(address.split('@')[0], []).append(entity)
+        self.email_index = index
+        self.email_local_index = local_index
+
+    def lookup_email(self, address):
+        """
+        Returns a list of the Student and ParentGuardian objects that use
+        this email address. If there is no "@" in address, it is looked up
+        as a local part instead, so "jsmith" finds "jsmith@school.org".
+        """
+        if getattr(self, 'email_index', None) is None:
+            self.build_email_index()
+        address = address.strip().casefold()
+        if '@' in address:
+            return self.email_index.get(address, [])
+        return self.email_local_index.get(address, [])
+
+    def build_birthday_index(self):
+        """
+        Two sorted indexes over students with a known birthday, so range
+        queries are a bisect instead of a scan over the roster.
+        self.birthday_index is (month_day keys, students), and
+        self.birth_date_index is (date ordinals, students).
+        """
+        students = [s for s in self.students.values() if s.birthday]
+        students.sort(key=lambda s: (month_day(s.birthday), s.name))
+        self.birthday_index = (
+            [month_day(s.birthday) for s in students],
+            students,
+        )
+        students = sorted(students, key=lambda s: (s.birthday, s.name))
+        self.birth_date_index = (
+            [s.birthday.toordinal() for s in students],
+            students,
+        )
+
+    def _ensure_birthday_index(self):
+        if getattr(self, 'birthday_index', None) is None:
+            self.build_birthday_index()
+
+    def birthdays_between(self, start: date, end: date):
+        """
+        Students whose birthday falls between start and end (inclusive),
+        regardless of the year they were born, in calendar order. The range
+        can wrap around new year.
+        """
+        self._ensure_birthday_index()
+        keys, students = self.birthday_index
+        if (end - start).days >= 365:
+            return list(students)
+        lo, hi = month_day(start), month_day(end)
+        if lo <= hi:
+            return students[bisect_left(keys, lo):bisect_right(keys, hi)]
+        return students[bisect_left(keys, lo):] + students[:bisect_right(keys, hi)]
+
+    def birthdays_by_homeroom(self, start: date, end: date):
+        """
+        birthdays_between, grouped into a dict of homeroom: [students].
+        """
+        homerooms = {}
+        for student in self.birthdays_between(start, end):
+            homerooms.setdefault(student.homeroom, []).append(student)
+        return homerooms
+
+    def birthdays_this_week(self, today=None):
+        """
+        Birthdays from Monday through Sunday of this week, by homeroom.
+        """
+        today = today or date.today()
+        monday = today - timedelta(days=today.weekday())
+        return self.birthdays_by_homeroom(monday, monday + timedelta(days=6))
+
+    def students_aged(self, min_age, max_age=None, on=None):
+        """
+        Students who are between min_age and max_age years old (inclusive)
+        on the date on, which defaults to today. Sorted oldest first.
+        """
+        self._ensure_birthday_index()
+        on = on or date.today()
+        max_age = min_age if max_age is None else max_age
+        ordinals, students = self.birth_date_index
+        born_after = years_before(on, max_age + 1).toordinal()
+        born_by = years_before(on, min_age).toordinal()
+        return students[
+            bisect_right(ordinals, born_after):bisect_right(ordinals, born_by)
+        ]
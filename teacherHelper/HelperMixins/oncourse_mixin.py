@@ -1,20 +1,62 @@
+from concurrent.futures import ProcessPoolExecutor
 import csv
+from datetime import date, datetime
+import logging
 
 from ..tools.csv_parser import IterCsv
+from ..tools.timing import StageTimer
 from ..student import Student
 from ..homeroom import Homeroom
 from ..parent_guardian import ParentGuardian
 
 
+logger = logging.getLogger(__name__)
+
+
 class OnCourseBooleanConversionError(Exception):
     pass
 
 
+def building_homeroom(building, teacher):
+    """
+    Key for a homeroom in a helper that spans more than one building. This is
+    also the value of Student.homeroom for those students, so that
+    helper.homerooms[student.homeroom] always works.
+    """
+    return f'{building}: {teacher}'
+
+
+def parse_birth_date(value):
+    """
+    OnCourse exports birth dates as MM/DD/YYYY, but hand-edited spreadsheets
+    end up with other formats. Returns a datetime.date, or None if the value
+    is blank or can't be read.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        month, day, year = value.split('/')
+        if len(year) == 4:
+            return date(int(year), int(month), int(day))
+    except ValueError:
+        pass
+    for fmt in ['%m/%d/%y', '%Y-%m-%d', '%m-%d-%Y']:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    logger.warning(f'Could not read birth date {value}')
+    return None
+
+
 class OnCourseMixin:
     def __init__(self, homerooms=None, students=None, groups=None):
         self.homerooms = homerooms
         self.students = students
         self.groups = groups
+        self.duplicate_students = []
+        self.ingest_timings = {}
 
     @classmethod
     def new_school_year(cls, student_data, guardian_data, strict_headers=False):
@@ -22,13 +64,16 @@ class OnCourseMixin:
         Instantiates guardians as an attribute of students. All guardians will
         never (as far as I can think) need to be accessed together, so they
         are not an attribute of the helper class.
+
+        The time spent in each stage is left in self.ingest_timings.
         """
         STUDENTS = {}
         HOMEROOMS = {}
+        timer = StageTimer()
 
         with open(student_data, 'r', encoding='utf-8-sig') as csvfile:
             rows = [r for r in csv.reader(csvfile, delimiter=',')]
-            # TODO: load birthday field as datetime
+            timer.lap('read student csv')
             # TODO: make thsi less repetitive. Just use a named collection.
             acceptable_headers = [
                 'first name',
@@ -66,7 +111,8 @@ class OnCourseMixin:
                         'grade_level': grade,
                         'homeroom': homeroom,
                         'email': email,
-                        'birthday': birthday,
+                        'birthday': parse_birth_date(birthday),
+                        'student_id': first + ' ' + last,
                     }
                 )
                 STUDENTS[first + ' ' + last] = student
@@ -79,12 +125,15 @@ class OnCourseMixin:
                 else:
                     HOMEROOMS[homeroom].students.append(student)
 
+        timer.lap('create students')
+
         # instantiation
         self = cls(
             HOMEROOMS, STUDENTS
         )
         with open(guardian_data, 'r', encoding='utf8') as csvfile:
             rows = [r for r in csv.reader(csvfile)]
+            timer.lap('read guardian csv')
             acceptable_headers = [
                 'guardian first name',
                 'guardian last name',
@@ -178,4 +227,92 @@ class OnCourseMixin:
                     # student is assigned while parent / guardian data is being
                     # parsed.
                     student.primary_contact = parent
+        timer.lap('create guardians')
+        self.build_indexes()
+        timer.lap('build indexes')
+        self.ingest_timings = timer.timings
         return self
+
+    @classmethod
+    def new_district(cls, buildings: dict, strict_headers=False, max_workers=None):
+        """
+        Instantiate one helper from the exports of several buildings.
+        buildings maps a building name to a (student_data, guardian_data)
+        tuple, which are the same two files that new_school_year takes. Each
+        building is parsed by new_school_year in its own process, and the
+        results are merged here in the order the buildings were given.
+
+        Homerooms are keyed by building_homeroom(building, teacher), and
+        Student.homeroom gets the same value, so two teachers with the same
+        name in different buildings stay separate.
+
+        A student whose name already exists in an earlier building is
+        treated as the same student if the email addresses match (or if
+        neither has one and the grade levels match). Those duplicates are
+        dropped and recorded in helper.duplicate_students as (name,
+        kept_building, dropped_building) tuples. Otherwise, they are a
+        different student with the same name, and they are keyed as
+        "First Last (Building)" instead.
+        """
+        timer = StageTimer()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    cls.new_school_year,
+                    student_data,
+                    guardian_data,
+                    strict_headers=strict_headers
+                )
+                for student_data, guardian_data in buildings.values()
+            ]
+            parts = [f.result() for f in futures]
+        timer.lap('parse buildings')
+
+        STUDENTS = {}
+        HOMEROOMS = {}
+        duplicates = []
+        for building, part in zip(buildings, parts):
+            dropped = set()
+            for name, student in part.students.items():
+                student.building = building
+                if (existing := STUDENTS.get(name)):
+                    if cls._is_same_student(existing, student):
+                        logger.warning(
+                            f'{name} from {building} is a duplicate of the '
+                            f'student from {existing.building}; dropping it.'
+                        )
+                        duplicates.append((name, existing.building, building))
+                        dropped.add(id(student))
+                        continue
+                    name = f'{name} ({building})'
+                    logger.info(
+                        f'Different student with the same name in {building}; '
+                        f'keyed as {name}'
+                    )
+                student.student_id = name
+                STUDENTS[name] = student
+            for teacher, homeroom in part.homerooms.items():
+                key = building_homeroom(building, teacher)
+                homeroom.building = building
+                homeroom.students = [
+                    s for s in homeroom.students if id(s) not in dropped
+                ]
+                for student in homeroom.students:
+                    student.homeroom = key
+                HOMEROOMS[key] = homeroom
+
+        self = cls(HOMEROOMS, STUDENTS)
+        self.duplicate_students = duplicates
+        timer.lap('merge buildings')
+        self.build_indexes()
+        timer.lap('build indexes')
+        self.ingest_timings = timer.timings
+        return self
+
+    @staticmethod
+    def _is_same_student(a, b):
+        if a.birthday and b.birthday and a.birthday != b.birthday:
+            return False
+        if a.email and b.email:
+            return a.email.lower() == b.email.lower()
+        return not (a.email or b.email) and a.grade_level == b.grade_level
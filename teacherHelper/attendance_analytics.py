@@ -0,0 +1,168 @@
+"""
+Attendance statistics over a processed MeetingSet, computed straight from
+its AttendanceStore with whole-array numpy operations, so that even a full
+year of meetings takes milliseconds.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .attendance_store import ABSENT
+
+
+GroupSummary = namedtuple('GroupSummary', [
+    'index',            # index in MeetingSet.groups
+    'topics',           # sorted list of meeting topics
+    'meetings',         # number of meetings
+    'historical_max',   # most students ever at one of the group's meetings
+    'attendance_rate',  # mean of attendance / historical_max
+    'mean_minutes',     # mean minutes attended, per attendee
+])
+
+
+class AttendanceAnalytics:
+    """
+    Attrs (arrays have one entry per student row, or per meeting column, of
+    meeting_set.attendance):
+
+        - student_ids       list of student_id, by row
+        - totals            total minutes attended, by row
+        - meetings_attended number of meetings attended, by row
+        - means             mean minutes per meeting attended, by row
+        - medians           median minutes per meeting attended, by row
+        - attendance        number of students at each meeting, by column
+        - meeting_means     mean minutes among attendees, by column
+        - meeting_stds      standard deviation of minutes among attendees;
+                            how consistently the class stayed, by column
+
+    Attendance of a group can only be measured against the most students
+    that were ever at one of its meetings, because the real size of the
+    group is unknown.
+    """
+
+    def __init__(self, meeting_set):
+        store = meeting_set.attendance
+        self.meeting_set = meeting_set
+        self.store = store
+        self.student_ids = store.student_ids
+
+        matrix = store.matrix
+        present = matrix != ABSENT
+        minutes = np.where(present, matrix, 0).astype(np.float64)
+
+        # per student
+        self.meetings_attended = present.sum(axis=1)
+        self.totals = minutes.sum(axis=1)
+        attended = np.maximum(self.meetings_attended, 1)
+        self.means = self.totals / attended
+        # absences sort to the end of each row, so each student's median is
+        # in the first meetings_attended entries of their sorted row.
+        ordered = np.sort(np.where(present, minutes, np.inf), axis=1)
+        rows = np.arange(len(ordered))
+        low = np.clip((self.meetings_attended - 1) // 2, 0, None)
+        high = np.clip(self.meetings_attended // 2, 0, None)
+        if ordered.shape[1]:
+            self.medians = (ordered[rows, low] + ordered[rows, high]) / 2
+            self.medians[self.meetings_attended == 0] = 0
+        else:
+            self.medians = np.zeros(len(ordered))
+
+        # per meeting
+        self.attendance = present.sum(axis=0)
+        count = np.maximum(self.attendance, 1)
+        self.meeting_means = minutes.sum(axis=0) / count
+        variance = (minutes ** 2).sum(axis=0) / count - self.meeting_means ** 2
+        self.meeting_stds = np.sqrt(np.clip(variance, 0, None))
+
+        self._group_columns = [
+            np.array(
+                [store.meeting_columns[str(m)] for m in group],
+                dtype=np.intp
+            )
+            for group in meeting_set.groups
+        ]
+
+    def percentile(self, q):
+        """
+        The q-th percentile (0-100) of students' total minutes.
+        """
+        if not len(self.totals):
+            return 0
+        return float(np.percentile(self.totals, q))
+
+    def top_students(self, q=90):
+        """
+        student_ids at or above the q-th percentile of total minutes, most
+        minutes first.
+        """
+        return self._ranked(self.totals >= self.percentile(q), reverse=True)
+
+    def bottom_students(self, q=10):
+        """
+        student_ids at or below the q-th percentile of total minutes, fewest
+        minutes first.
+        """
+        return self._ranked(self.totals <= self.percentile(q))
+
+    def _ranked(self, mask, reverse=False):
+        rows = np.flatnonzero(mask)
+        rows = rows[np.argsort(self.totals[rows], kind='stable')]
+        if reverse:
+            rows = rows[::-1]
+        return [self.student_ids[r] for r in rows]
+
+    def group_summaries(self):
+        """
+        A GroupSummary for each group in meeting_set.groups, in order.
+        """
+        summaries = []
+        for i, columns in enumerate(self._group_columns):
+            attendance = self.attendance[columns]
+            historical_max = int(attendance.max()) if len(columns) else 0
+            rate = (
+                float((attendance / historical_max).mean())
+                if historical_max else 0.0
+            )
+            attendees = attendance.sum()
+            mean_minutes = (
+                float((self.meeting_means[columns] * attendance).sum() / attendees)
+                if attendees else 0.0
+            )
+            summaries.append(GroupSummary(
+                i,
+                sorted({m.topic for m in self.meeting_set.groups[i]}),
+                len(columns),
+                historical_max,
+                rate,
+                mean_minutes,
+            ))
+        return summaries
+
+    def best_and_worst_groups(self):
+        """
+        (best, worst) GroupSummary by attendance rate, or (None, None) if
+        there are no groups.
+        """
+        summaries = self.group_summaries()
+        if not summaries:
+            return None, None
+        rates = [s.attendance_rate for s in summaries]
+        return summaries[int(np.argmax(rates))], summaries[int(np.argmin(rates))]
+
+    def over_time(self, group_index):
+        """
+        The group's meetings in chronological order, as a list of
+        (meeting, attendance, mean minutes, standard deviation of minutes).
+        """
+        columns = self._group_columns[group_index]
+        meetings = self.meeting_set.groups[group_index]
+        order = np.argsort(self.store.meeting_times[columns], kind='stable')
+        return [
+            (
+                meetings[i],
+                int(self.attendance[columns[i]]),
+                float(self.meeting_means[columns[i]]),
+                float(self.meeting_stds[columns[i]]),
+            )
+            for i in order
+        ]
@@ -0,0 +1,172 @@
+"""
+Persistent archive of zoom attendance in SQLite, so that a student's
+attendance history can be looked up without reading every zoom report
+again.
+"""
+from collections import namedtuple
+import sqlite3
+
+
+AttendanceSummary = namedtuple('AttendanceSummary', [
+    'student_id',
+    'meetings',         # number of meetings attended
+    'total_minutes',
+    'average_minutes',
+    'connections',      # times joined; more than meetings if they rejoined
+    'first',            # datetime (isoformat) of the first meeting attended
+    'last',             # datetime (isoformat) of the last meeting attended
+    'topics',           # [(topic, meetings, average minutes)], most first
+    'recent',           # [(datetime, topic, minutes)], most recent first
+])
+
+
+class AttendanceArchive:
+    """
+    Open (and create if needed) the archive at path. Feed it processed
+    MeetingSets with add_meeting_set; meetings that are already in the
+    archive are skipped, so the same reports can be archived more than once.
+
+        with AttendanceArchive('data/attendance.sqlite3') as archive:
+            archive.add_meeting_set(meeting_set)
+            print(archive.student_summary('Jane Doe'))
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meetings (
+            id INTEGER PRIMARY KEY,
+            topic TEXT NOT NULL,
+            start TEXT NOT NULL,
+            UNIQUE (start, topic)
+        );
+        CREATE TABLE IF NOT EXISTS students (
+            id INTEGER PRIMARY KEY,
+            student_id TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL,
+            homeroom TEXT,
+            grade_level INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS attendance (
+            student INTEGER NOT NULL REFERENCES students (id),
+            meeting INTEGER NOT NULL REFERENCES meetings (id),
+            start TEXT NOT NULL,
+            minutes INTEGER NOT NULL,
+            connections INTEGER NOT NULL DEFAULT 1,
+            PRIMARY KEY (student, start, meeting)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS attendance_start ON attendance (start);
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(self.SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *a, **kw):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def add_meeting_set(self, meeting_set) -> int:
+        """
+        Archive every meeting in meeting_set and who attended it. Returns
+        the number of meetings that weren't in the archive yet.
+        """
+        with self.connection as db:
+            before = db.execute('SELECT COUNT(*) FROM meetings').fetchone()[0]
+            db.executemany(
+                'INSERT OR IGNORE INTO meetings (topic, start) VALUES (?, ?)',
+                [(m.topic, m.datetime.isoformat()) for m in meeting_set.meetings]
+            )
+            students = {
+                st.student_id: st
+                for m in meeting_set.meetings
+                for st in m.durations
+            }
+            db.executemany(
+                'INSERT INTO students (student_id, name, homeroom, grade_level) '
+                'VALUES (?, ?, ?, ?) ON CONFLICT (student_id) DO UPDATE SET '
+                'name = excluded.name, homeroom = excluded.homeroom, '
+                'grade_level = excluded.grade_level',
+                [
+                    (i, st.name, st.homeroom, st.grade_level)
+                    for i, st in students.items()
+                ]
+            )
+            meeting_ids = dict(
+                ((start, topic), i) for i, start, topic
+                in db.execute('SELECT id, start, topic FROM meetings')
+            )
+            student_ids = dict(db.execute('SELECT student_id, id FROM students'))
+            rows = []
+            for meeting in meeting_set.meetings:
+                start = meeting.datetime.isoformat()
+                meeting_id = meeting_ids[(start, meeting.topic)]
+                for st, minutes in meeting.durations.items():
+                    rows.append((
+                        student_ids[st.student_id],
+                        meeting_id,
+                        start,
+                        minutes,
+                        meeting.connections.get(st, 1),
+                    ))
+            # like the AttendanceStore, only the first duration counts
+            db.executemany(
+                'INSERT OR IGNORE INTO attendance '
+                '(student, meeting, start, minutes, connections) '
+                'VALUES (?, ?, ?, ?, ?)',
+                rows
+            )
+            after = db.execute('SELECT COUNT(*) FROM meetings').fetchone()[0]
+        return after - before
+
+    def student_summary(self, student_id, since=None, recent=5):
+        """
+        AttendanceSummary of the student's archived attendance, optionally
+        only from meetings at or after since (a datetime). None if the
+        student never attended anything.
+        """
+        where = 'students.student_id = ?'
+        params = [student_id]
+        if since is not None:
+            where += ' AND attendance.start >= ?'
+            params.append(since.isoformat())
+        tables = (
+            'attendance JOIN students ON attendance.student = students.id '
+            'JOIN meetings ON attendance.meeting = meetings.id'
+        )
+        db = self.connection
+        meetings, total, connections, first, last = db.execute(
+            'SELECT COUNT(*), SUM(minutes), SUM(connections), '
+            'MIN(attendance.start), MAX(attendance.start) '
+            f'FROM {tables} WHERE {where}',
+            params
+        ).fetchone()
+        if not meetings:
+            return None
+        topics = db.execute(
+            'SELECT topic, COUNT(*), AVG(minutes) '
+            f'FROM {tables} WHERE {where} '
+            'GROUP BY topic ORDER BY COUNT(*) DESC, topic',
+            params
+        ).fetchall()
+        latest = db.execute(
+            'SELECT attendance.start, topic, minutes '
+            f'FROM {tables} WHERE {where} '
+            'ORDER BY attendance.start DESC LIMIT ?',
+            params + [recent]
+        ).fetchall()
+        return AttendanceSummary(
+            student_id,
+            meetings,
+            total,
+            total / meetings,
+            connections,
+            first,
+            last,
+            topics,
+            latest,
+        )
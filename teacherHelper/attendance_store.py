@@ -0,0 +1,144 @@
+import numpy as np
+
+
+ABSENT = -1
+
+
+class AttendanceStore:
+    """
+    Minutes of zoom attendance for every student at every meeting of a
+    MeetingSet, as one dense int16 matrix. Rows are students (by
+    student_id), columns are meetings (by str(meeting)), and ABSENT marks a
+    student who wasn't at a meeting; 0 is a student who was there for less
+    than a minute.
+
+    Meeting metadata lives in side tables indexed by column: meeting_keys,
+    meeting_topics, and meeting_times (POSIX timestamps, as an array).
+
+    The matrix grows by doubling, so adding students and meetings one at a
+    time is cheap. Use self.matrix for the filled-in part.
+    """
+
+    def __init__(self):
+        self.student_ids = []       # row: student_id
+        self.student_rows = {}      # student_id: row
+        self.meeting_keys = []      # column: str(meeting)
+        self.meeting_columns = {}   # str(meeting): column
+        self.meeting_topics = []    # column: topic
+        self._meeting_times = []    # column: timestamp
+        self._data = np.full((64, 16), ABSENT, dtype=np.int16)
+
+    def __len__(self):
+        return len(self.meeting_keys)
+
+    @property
+    def matrix(self):
+        return self._data[:len(self.student_ids), :len(self.meeting_keys)]
+
+    @property
+    def meeting_times(self):
+        return np.array(self._meeting_times, dtype=np.float64)
+
+    def _grow(self, rows, columns):
+        have_rows, have_columns = self._data.shape
+        if rows <= have_rows and columns <= have_columns:
+            return
+        # only double the dimension that ran out
+        if rows > have_rows:
+            rows = max(rows, have_rows * 2)
+        if columns > have_columns:
+            columns = max(columns, have_columns * 2)
+        data = np.full(
+            (max(rows, have_rows), max(columns, have_columns)),
+            ABSENT,
+            dtype=np.int16
+        )
+        data[:have_rows, :have_columns] = self._data
+        self._data = data
+
+    def add_student(self, student_id) -> int:
+        """
+        Row for student_id, which is added if it isn't there yet.
+        """
+        if (row := self.student_rows.get(student_id)) is None:
+            row = self.student_rows[student_id] = len(self.student_ids)
+            self.student_ids.append(student_id)
+            self._grow(row + 1, len(self.meeting_keys))
+        return row
+
+    def add_meeting(self, meeting) -> int:
+        """
+        Column for meeting, which is added if it isn't there yet. Meetings
+        with the same str() (same topic and start time) share a column.
+        """
+        key = str(meeting)
+        if (column := self.meeting_columns.get(key)) is None:
+            column = self.meeting_columns[key] = len(self.meeting_keys)
+            self.meeting_keys.append(key)
+            self.meeting_topics.append(meeting.topic)
+            self._meeting_times.append(meeting.datetime.timestamp())
+            self._grow(len(self.student_ids), column + 1)
+        return column
+
+    def record(self, student_id, column, duration):
+        """
+        Record the minutes a student attended the meeting in column. Like
+        dict.setdefault, the first duration recorded for a pair wins.
+        """
+        row = self.add_student(student_id)
+        if self._data[row, column] == ABSENT:
+            self._data[row, column] = min(duration, np.iinfo(np.int16).max)
+
+    def record_meeting(self, meeting):
+        """
+        Add meeting, and record meeting.durations into its column.
+        """
+        column = self.add_meeting(meeting)
+        for st, duration in meeting.durations.items():
+            self.record(st.student_id, column, duration)
+        return column
+
+    def get(self, student_id, meeting, default=0):
+        """
+        Minutes student_id spent in meeting (a Meeting or its str()), or
+        default if they weren't there.
+        """
+        row = self.student_rows.get(student_id)
+        column = self.meeting_columns.get(str(meeting))
+        if row is None or column is None:
+            return default
+        if (duration := self._data[row, column]) == ABSENT:
+            return default
+        return int(duration)
+
+    def student_report(self, student_id) -> dict:
+        """
+        {str(meeting): minutes} for every meeting student_id attended; the
+        shape of the old Student.zoom_attendance_report.
+        """
+        if (row := self.student_rows.get(student_id)) is None:
+            return {}
+        durations = self.matrix[row]
+        return {
+            self.meeting_keys[column]: int(durations[column])
+            for column in np.flatnonzero(durations != ABSENT)
+        }
+
+    def meeting_attendance(self, column):
+        """
+        (student_ids, durations) of everyone at the meeting in column.
+        """
+        durations = self.matrix[:, column]
+        rows = np.flatnonzero(durations != ABSENT)
+        return [self.student_ids[r] for r in rows], durations[rows]
+
+    def columns_attended(self, student_ids):
+        """
+        Columns of every meeting that any of student_ids attended.
+        """
+        rows = [
+            self.student_rows[i] for i in student_ids if i in self.student_rows
+        ]
+        if not rows:
+            return []
+        return list(np.flatnonzero((self.matrix[rows] != ABSENT).any(axis=0)))
@@ -6,13 +6,13 @@ from datetime import datetime
 
 from fuzzywuzzy import process
 
-from .HelperMixins import OnCourseMixin, SillyMixin
+from .HelperMixins import OnCourseMixin, SillyMixin, LookupMixin
 
 MODULE_DIR = os.path.dirname(__file__)
 logger = logging.getLogger(__name__)
 
 
-class Helper(OnCourseMixin, SillyMixin):
+class Helper(OnCourseMixin, SillyMixin, LookupMixin):
     """
     Driver for the entire module! See README.md test
     """
@@ -25,6 +25,11 @@ class Helper(OnCourseMixin, SillyMixin):
         self.homerooms = homerooms
         self.students = students
         self.groups = groups
+        self.phone_index = None
+        self.email_index = None
+        self.email_local_index = None
+        self.birthday_index = None
+        self.birth_date_index = None
         self.cache_dir = os.path.join(__file__, 'cache')
 
     def write_cache(self):
@@ -202,6 +207,10 @@ class Helper(OnCourseMixin, SillyMixin):
         with shelve.open(os.path.join(MODULE_DIR, 'cache'), 'r') as db:
             data = db['data']
             date = db['date']
+        # caches from before student_id was assigned at ingest
+        for key, st in data.students.items():
+            if not st.student_id:
+                st.student_id = key
         if check_date and (datetime.now().month in range(9, 12) and date.month in range(1, 7)):
             raise Exception(
                 'It appears that the cache is from last school year. Please\n'
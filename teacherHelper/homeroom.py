@@ -1,11 +1,15 @@
 
 class Homeroom:
-    def __init__(self, teacher, grade_level, students):
+    def __init__(self, teacher, grade_level, students, building=None):
         """
         Ensure that string constants for csv headers of id, student names, and
         (if applicable) student emails are correct.
+
+        building is only assigned when the helper was created from more than
+        one building's exports; see OnCourseMixin.new_district.
         """
         super().__init__()
         self.teacher = teacher
         self.grade_level = grade_level
         self.students = students
+        self.building = building
@@ -1,4 +1,8 @@
 class Student:
+    # AttendanceStore of the most recent MeetingSet that recorded this
+    # student, which assigns it; see the zoom_attendance_report property
+    _attendance_store = None
+
     def __init__(self, context):
         context.setdefault('groups', [])
         context.setdefault('guardians', [])
@@ -6,11 +10,15 @@ class Student:
         self.last_name = context.get('last_name')
         self.student_id = context.get('student_id')
         self.homeroom = context.get('homeroom')
+        self.building = context.get('building')
         self.grade_level = context.get('grade_level')
         self.groups = context.get('groups')
         self.email = context.get('email')
+        self.birthday = context.get('birthday')  # datetime.date or None
         self.guardians = context.get('guardians')
         self.name = self.first_name + ' ' + self.last_name
+        # key in helper.students; only differs from name for duplicate names
+        self.student_id = self.student_id or self.name
         """
         primary_contact is an instance of ParentGuardian, which is assigned
         during the parsing of parent / guardian data in the new_school_year
@@ -18,6 +26,35 @@ class Student:
         """
         self.primary_contact = None
 
+    def __getstate__(self):
+        # attendance belongs to the MeetingSet, not the cached roster
+        state = self.__dict__.copy()
+        state.pop('zoom_attendance_report', None)
+        state.pop('_attendance_store', None)
+        return state
+
+    def __setstate__(self, state):
+        state.pop('zoom_attendance_report', None)  # from older caches
+        self.__dict__.update(state)
+
+    @property
+    def zoom_attendance_report(self) -> dict:
+        """
+        {str(meeting): minutes} for every zoom meeting this student attended,
+        built on demand from the attendance store of the most recent
+        MeetingSet that recorded the student's attendance. A dict assigned
+        directly to a student is used instead.
+        """
+        if 'zoom_attendance_report' in self.__dict__:
+            return self.__dict__['zoom_attendance_report']
+        if self._attendance_store is not None:
+            return self._attendance_store.student_report(self.student_id)
+        return {}
+
+    @zoom_attendance_report.setter
+    def zoom_attendance_report(self, report):
+        self.__dict__['zoom_attendance_report'] = report
+
     def __str__(self, verbose=False):
         """
         Assemble nice printout of student information, and student's guardian
@@ -0,0 +1,27 @@
+import tempfile
+import unittest
+
+from ..helper import Helper
+from ..tools.synthetic_oncourse import SyntheticOnCourse
+from ..zoom_attendance_report import HelperConsumer
+
+
+class SyntheticRosterTestCase(unittest.TestCase):
+    """
+    Base for tests that need a roster: a Helper built once per class from a
+    synthetic OnCourse export of STUDENTS students, generated with SEED.
+    Each test runs with it as HelperConsumer.helper.
+    """
+    STUDENTS = 60
+    SEED = 0
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with tempfile.TemporaryDirectory() as directory:
+            paths = SyntheticOnCourse(cls.STUDENTS, seed=cls.SEED).write(directory)
+            cls.helper = Helper.new_school_year(*paths)
+
+    def setUp(self):
+        super().setUp()
+        HelperConsumer.helper = self.helper
@@ -0,0 +1,73 @@
+import statistics
+
+from . import SyntheticRosterTestCase
+from ..attendance_analytics import AttendanceAnalytics
+from ..tools.synthetic_zoom import synthetic_meeting_set
+from ..zoom_attendance_report import WorkbookWriter
+
+
+class TestAttendanceAnalytics(SyntheticRosterTestCase):
+    """
+    Compare the array math against plain python over a synthetic month of
+    meetings.
+    """
+    STUDENTS = 150
+    SEED = 2
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.meeting_set = synthetic_meeting_set(
+            cls.helper,
+            days=20,
+            groups=3,
+            attendance_rate=0.6
+        )
+        cls.analytics = AttendanceAnalytics(cls.meeting_set)
+
+    def test_student_statistics(self):
+        for row, student_id in enumerate(self.analytics.student_ids):
+            minutes = list(
+                self.helper.students[student_id].zoom_attendance_report.values()
+            )
+            self.assertEqual(self.analytics.totals[row], sum(minutes))
+            self.assertAlmostEqual(
+                self.analytics.means[row],
+                statistics.mean(minutes)
+            )
+            self.assertEqual(
+                self.analytics.medians[row],
+                statistics.median(minutes)
+            )
+
+    def test_meeting_statistics(self):
+        for meeting in self.meeting_set.meetings:
+            column = self.meeting_set.attendance.meeting_columns[str(meeting)]
+            minutes = list(meeting.durations.values())
+            self.assertEqual(self.analytics.attendance[column], len(minutes))
+            self.assertAlmostEqual(
+                self.analytics.meeting_stds[column],
+                statistics.pstdev(minutes)
+            )
+
+    def test_group_attendance_rate(self):
+        for summary in self.analytics.group_summaries():
+            group = self.meeting_set.groups[summary.index]
+            most = max(len(m.durations) for m in group)
+            self.assertEqual(summary.historical_max, most)
+            self.assertAlmostEqual(
+                summary.attendance_rate,
+                statistics.mean(len(m.durations) / most for m in group)
+            )
+
+    def test_highlight_sheet_is_written(self):
+        workbook = WorkbookWriter(self.meeting_set).generate_report()
+        values = [
+            cell.value
+            for row in workbook['Highlights'].iter_rows()
+            for cell in row
+        ]
+        self.assertIn('Most Attendance', values)
+        self.assertIn('Consistency Over Time', values)
+        self.assertIn('Best attendance', values)
+        self.assertIn('Worst attendance', values)
@@ -0,0 +1,37 @@
+from . import SyntheticRosterTestCase
+from ..attendance_archive import AttendanceArchive
+from ..tools.synthetic_zoom import synthetic_meeting_set
+
+
+class TestAttendanceArchive(SyntheticRosterTestCase):
+    STUDENTS = 150
+    SEED = 4
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.meeting_set = synthetic_meeting_set(cls.helper, days=10, groups=3)
+
+    def setUp(self):
+        super().setUp()
+        self.archive = AttendanceArchive(':memory:')
+        self.archive.add_meeting_set(self.meeting_set)
+
+    def tearDown(self):
+        self.archive.close()
+
+    def test_meetings_are_only_archived_once(self):
+        self.assertEqual(self.archive.add_meeting_set(self.meeting_set), 0)
+        count, = self.archive.connection.execute(
+            'SELECT COUNT(*) FROM meetings'
+        ).fetchone()
+        self.assertEqual(count, len(self.meeting_set.meetings))
+
+    def test_student_summary(self):
+        student_id = self.meeting_set.attendance.student_ids[0]
+        report = self.helper.students[student_id].zoom_attendance_report
+        summary = self.archive.student_summary(student_id)
+        self.assertEqual(summary.meetings, len(report))
+        self.assertEqual(summary.total_minutes, sum(report.values()))
+        self.assertEqual(summary.last, max(report)[:19])
+        self.assertIsNone(self.archive.student_summary('Nobody Atall'))
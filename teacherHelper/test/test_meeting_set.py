@@ -0,0 +1,268 @@
+import datetime
+import io
+
+from . import SyntheticRosterTestCase
+from ..attendance_store import AttendanceStore
+from ..tools.synthetic_zoom import (
+    adversarial_reports,
+    synthetic_meeting_set,
+    synthetic_reports,
+)
+from ..zoom_attendance_report import Meeting, MeetingSet
+
+
+def brute_force_groups(meetings, ratio):
+    """
+    Group meetings the way MeetingSet did before GroupingIndex: compare each
+    meeting with every group, against the first meeting in the group whose
+    length is closest to its own.
+    """
+    groups = []
+    for meeting in meetings:
+        for group in groups:
+            closest, smallest = None, 100
+            for previous in group:
+                if (difference := abs(len(previous) - len(meeting))) < smallest:
+                    closest, smallest = previous, difference
+            if closest is None:
+                continue
+            a = {st.student_id for st in closest.attendees}
+            b = {st.student_id for st in meeting.attendees}
+            if (len(a) + len(b)) * ratio > len(a | b):
+                group.append(meeting)
+                break
+        else:
+            groups.append([meeting])
+    return [[str(m) for m in group] for group in groups]
+
+
+class TestSerialization(SyntheticRosterTestCase):
+    STUDENTS = 150
+    SEED = 3
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.meeting_set = synthetic_meeting_set(cls.helper, days=10, groups=3)
+        cls.meeting_set.meetings[0].unidentifiable = ['xX gamer Xx']
+
+    def assertSameMeetingSet(self, a, b):
+        self.assertEqual(
+            [[str(m) for m in g] for g in a.groups],
+            [[str(m) for m in g] for g in b.groups]
+        )
+        for x, y in zip(a.meetings, b.meetings):
+            self.assertEqual(x.attendees, y.attendees)
+            self.assertEqual(x.durations, y.durations)
+            self.assertEqual(x.unidentifiable, y.unidentifiable)
+        self.assertTrue((a.attendance.matrix == b.attendance.matrix).all())
+
+    def test_attendance_only_grows_where_it_ran_out(self):
+        store = AttendanceStore()
+        store.add_student('only student')
+        for meeting in self.meeting_set.meetings:
+            store.add_meeting(meeting)
+        self.assertEqual(store._data.shape, (64, 32))
+
+    def test_round_trip(self):
+        data = self.meeting_set.serialize()
+        loaded = MeetingSet.deserialize_from_string(data)
+        self.assertSameMeetingSet(self.meeting_set, loaded)
+        self.assertEqual(loaded.serialize(), data)
+
+    def test_compressed_round_trip(self):
+        data = self.meeting_set.serialize(compress=True)
+        loaded = MeetingSet.deserialize_from_string(data)
+        self.assertSameMeetingSet(self.meeting_set, loaded)
+
+    def test_unknown_version_is_rejected(self):
+        data = self.meeting_set.get_serializable_data()
+        data['version'] = 99
+        with self.assertRaises(ValueError):
+            MeetingSet.deserialize(data)
+
+    def test_missing_students_are_reported(self):
+        data = self.meeting_set.get_serializable_data()
+        data['students'][0] = 'Nobody Atall'
+        loaded = MeetingSet.deserialize(data)
+        self.assertEqual(loaded.missing_students, ['Nobody Atall'])
+        self.assertEqual(
+            len(loaded.attendance.student_ids),
+            len(self.meeting_set.attendance.student_ids) - 1
+        )
+
+    def test_dump_and_load(self):
+        fp = io.StringIO()
+        self.meeting_set.dump(fp)
+        fp.seek(0)
+        loaded = MeetingSet.load(fp)
+        self.assertSameMeetingSet(self.meeting_set, loaded)
+        self.assertEqual(loaded.serialize(), self.meeting_set.serialize())
+
+
+class TestProcessing(SyntheticRosterTestCase):
+    STUDENTS = 60
+    SEED = 5
+
+    def test_meetings_are_finalized(self):
+        reports = synthetic_reports(self.helper, 4, groups=2, variant_rate=0)
+        meeting_set = MeetingSet(reports)
+        for _ in meeting_set.process():
+            pass
+        self.assertEqual(len(meeting_set.groups), 2)
+        for meeting in meeting_set.meetings:
+            self.assertFalse(hasattr(meeting, '__dict__'))
+            self.assertIsNone(meeting.known_matches)
+            self.assertIsNone(meeting.csv_string)
+            self.assertTrue(meeting.attendees)
+            self.assertEqual(set(meeting.durations), set(meeting.attendees))
+            self.assertEqual(meeting.unidentifiable.count('xX gamer Xx'), 1)
+
+    def test_adversarial_reports_come_with_answers(self):
+        reports = adversarial_reports(self.helper, 2, kinds={'exact': 1}, strangers=1)
+        meeting_set = MeetingSet([r.csv for r in reports])
+        for _ in meeting_set.process():
+            pass
+        for meeting, report in zip(meeting_set.meetings, reports):
+            self.assertEqual(
+                {st.student_id for st in meeting.attendees},
+                set(report.attendees)
+            )
+        self.assertEqual(
+            list(meeting_set.read_timings),
+            ['parse', 'first pass', 'second pass', 'durations', 'grouping']
+        )
+
+    def test_regroup_and_sweep_ratios(self):
+        meeting_set = synthetic_meeting_set(self.helper, days=10, groups=3)
+        groups = [[str(m) for m in g] for g in meeting_set.groups]
+        self.assertEqual(meeting_set.regroup(), 3)
+        self.assertEqual([[str(m) for m in g] for g in meeting_set.groups], groups)
+
+        sweep = meeting_set.sweep_ratios([0.5, 0.9])
+        self.assertEqual(sweep, {0.5: 30, 0.9: 3})
+        self.assertEqual(meeting_set.TOTAL_TO_UNION_RATIO_ADJUSTMENT, 0.9)
+        self.assertEqual([[str(m) for m in g] for g in meeting_set.groups], groups)
+
+    def test_student_reports_outlive_later_sets(self):
+        first = synthetic_meeting_set(self.helper, days=4, groups=2)
+        st = first.meetings[0].attendees[0]
+        report = first.attendance.student_report(st.student_id)
+        self.assertTrue(report)
+        self.assertEqual(st.zoom_attendance_report, report)
+
+        MeetingSet([])
+        self.assertEqual(st.zoom_attendance_report, report)
+        loaded = MeetingSet.deserialize(first.get_serializable_data())
+        self.assertIsNot(st._attendance_store, first.attendance)
+        self.assertEqual(st.zoom_attendance_report, report)
+        MeetingSet([])
+        self.assertIs(st._attendance_store, loaded.attendance)
+
+    def test_grouping_index_matches_brute_force(self):
+        meeting_set = synthetic_meeting_set(
+            self.helper,
+            days=15,
+            groups=4,
+            attendance_rate=0.6
+        )
+        for ratio in (0.5, 0.75, 0.9, 1.1):
+            meeting_set.regroup(ratio)
+            self.assertEqual(
+                [[str(m) for m in g] for g in meeting_set.groups],
+                brute_force_groups(meeting_set.meetings, ratio),
+                ratio
+            )
+
+    def test_closest_meeting_ties_go_to_the_earlier_meeting(self):
+        students = list(self.helper.students.values())
+
+        def meeting(day, attendees):
+            m = Meeting('')
+            m.topic = 'Tie'
+            m.datetime = datetime.datetime(2020, 10, day)
+            m.attendees = attendees
+            return m
+
+        # the new meeting is one student away from both in length, and only
+        # overlaps with b, so it only joins the group if b comes first
+        a = meeting(1, students[:10])
+        b = meeting(2, students[20:32])
+        new = meeting(3, students[20:31])
+        for group, expected in (([a, b], []), ([b, a], [b, a])):
+            meeting_set = MeetingSet([])
+            meeting_set.groups = [group]
+            self.assertEqual(meeting_set.match_meeting_with_group_by_union(new), expected)
+
+    def test_parallel_processing_matches_serial(self):
+        reports = synthetic_reports(self.helper, 8, groups=2)
+        serial = MeetingSet(reports)
+        for _ in serial.process():
+            pass
+        parallel = MeetingSet(reports)
+        for _ in parallel.process(parallel=True, max_workers=2):
+            pass
+        self.assertEqual(
+            [[str(m) for m in g] for g in serial.groups],
+            [[str(m) for m in g] for g in parallel.groups]
+        )
+        self.assertEqual(len(serial.meetings), len(parallel.meetings))
+        for a, b in zip(serial.meetings, parallel.meetings):
+            self.assertEqual(a.attendees, b.attendees)
+            self.assertEqual(a.durations, b.durations)
+        self.assertTrue((serial.attendance.matrix == parallel.attendance.matrix).all())
+
+
+class TestAddReports(SyntheticRosterTestCase):
+    STUDENTS = 60
+    SEED = 9
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reports = synthetic_reports(cls.helper, 12, groups=3, variant_rate=0)
+
+    def processed(self, reports):
+        meeting_set = MeetingSet(reports)
+        for _ in meeting_set.process():
+            pass
+        return meeting_set
+
+    def assertSameGroupsAndAttendance(self, a, b):
+        self.assertEqual(
+            [[str(m) for m in g] for g in a.groups],
+            [[str(m) for m in g] for g in b.groups]
+        )
+        self.assertEqual(
+            [m.durations for m in a.meetings],
+            [m.durations for m in b.meetings]
+        )
+        self.assertTrue((a.attendance.matrix == b.attendance.matrix).all())
+
+    def test_adding_reports_matches_processing_them_all(self):
+        full = self.processed(self.reports)
+        meeting_set = self.processed(self.reports[:7])
+        changed = meeting_set.add_reports(self.reports[7:])
+        self.assertSameGroupsAndAttendance(full, meeting_set)
+
+        added = {str(m) for m in meeting_set.meetings[7:]}
+        self.assertEqual(changed, {
+            i for i, group in enumerate(meeting_set.groups)
+            if added & {str(m) for m in group}
+        })
+        self.assertEqual(meeting_set.changed_groups, changed)
+
+    def test_reports_already_read_are_skipped(self):
+        meeting_set = self.processed(self.reports[:7])
+        with self.assertLogs('teacherHelper.zoom_attendance_report', 'WARNING'):
+            changed = meeting_set.add_reports(self.reports[5:8])
+        self.assertEqual(len(meeting_set.meetings), 8)
+        self.assertEqual(len(changed), 1)
+
+    def test_adding_reports_to_a_deserialized_set(self):
+        full = self.processed(self.reports)
+        loaded = MeetingSet.deserialize(
+            self.processed(self.reports[:7]).get_serializable_data()
+        )
+        loaded.add_reports(self.reports[7:])
+        self.assertSameGroupsAndAttendance(full, loaded)
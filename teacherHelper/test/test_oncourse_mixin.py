@@ -0,0 +1,133 @@
+from datetime import date
+import tempfile
+import unittest
+
+from ..helper import Helper
+from ..tools.synthetic_oncourse import SyntheticOnCourse
+
+
+class TestNewSchoolYear(unittest.TestCase):
+    """
+    Ingest a small synthetic roster, so that no real data is needed.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.roster = SyntheticOnCourse(300, seed=1)
+        cls.paths = cls.roster.write(cls.tmp.name)
+        cls.helper = Helper.new_school_year(*cls.paths)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_generator_is_deterministic(self):
+        again = SyntheticOnCourse(300, seed=1)
+        self.assertEqual(again.students, self.roster.students)
+        self.assertEqual(again.guardians, self.roster.guardians)
+
+    def test_all_students_and_guardians_are_loaded(self):
+        self.assertEqual(len(self.helper.students), 300)
+        n_guardians = sum(
+            len(s.guardians) for s in self.helper.students.values()
+        )
+        self.assertEqual(n_guardians, len(self.roster.guardians))
+
+    def test_phone_lookup_groups_siblings(self):
+        household = next(h for h in self.roster.households if len(h) > 1)
+        student = self.helper.students[
+            household[0]['first_name'] + ' ' + household[0]['last_name']
+        ]
+        guardian = next(g for g in student.guardians if g.mobile_phone)
+        matches = self.helper.lookup_phone(str(guardian.mobile_phone))
+        _, students = next(m for m in matches if m[0].name == guardian.name)
+        self.assertEqual(
+            {s.name for s in students},
+            {f'{s["first_name"]} {s["last_name"]}' for s in household}
+        )
+
+    def test_email_lookup(self):
+        student = next(iter(self.helper.students.values()))
+        self.assertIn(student, self.helper.lookup_email(student.email.upper()))
+        self.assertIn(
+            student,
+            self.helper.lookup_email(student.email.split('@')[0])
+        )
+
+    def test_birthdays_between_wraps_around_new_year(self):
+        start, end = date(2020, 12, 20), date(2021, 1, 10)
+        expected = {
+            s.name for s in self.helper.students.values()
+            if s.birthday and (
+                (s.birthday.month, s.birthday.day) >= (12, 20)
+                or (s.birthday.month, s.birthday.day) <= (1, 10)
+            )
+        }
+        found = self.helper.birthdays_between(start, end)
+        self.assertEqual({s.name for s in found}, expected)
+
+
+class TestNewDistrict(unittest.TestCase):
+    """
+    Two synthetic buildings, where South has a copy of a student from North
+    and a different student with the same name as another North student.
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        north = SyntheticOnCourse(40, seed=11)
+        south = SyntheticOnCourse(40, seed=12)
+        south_names = {(s['first_name'], s['last_name']) for s in south.students}
+        cls.same, cls.other = [
+            s for s in north.students
+            if (s['first_name'], s['last_name']) not in south_names
+        ][:2]
+        homeroom = south.students[0]['homeroom']
+        south.students.append(dict(cls.same, homeroom=homeroom))
+        south.students.append(dict(
+            cls.other,
+            homeroom=homeroom,
+            email='someone.else@students.example.org'
+        ))
+        cls.buildings = {
+            'North': north.write(f'{cls.tmp.name}/north'),
+            'South': south.write(f'{cls.tmp.name}/south'),
+        }
+        cls.helper = Helper.new_district(cls.buildings)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def name(self, student):
+        return f'{student["first_name"]} {student["last_name"]}'
+
+    def test_same_student_in_two_buildings_is_kept_once(self):
+        name = self.name(self.same)
+        self.assertIn((name, 'North', 'South'), self.helper.duplicate_students)
+        self.assertEqual(self.helper.students[name].building, 'North')
+        self.assertNotIn(f'{name} (South)', self.helper.students)
+
+    def test_different_student_with_the_same_name_is_qualified(self):
+        name = self.name(self.other)
+        self.assertEqual(self.helper.students[name].email, self.other['email'])
+        student = self.helper.students[f'{name} (South)']
+        self.assertEqual(student.building, 'South')
+        self.assertEqual(student.student_id, f'{name} (South)')
+        self.assertEqual(student.email, 'someone.else@students.example.org')
+
+    def test_homerooms_are_qualified_by_building(self):
+        for key, homeroom in self.helper.homerooms.items():
+            self.assertEqual(key, f'{homeroom.building}: {homeroom.teacher}')
+        for student in self.helper.students.values():
+            self.assertIn(student.homeroom, self.helper.homerooms)
+            self.assertTrue(student.homeroom.startswith(f'{student.building}: '))
+
+    def test_one_worker_gives_the_same_helper(self):
+        serial = Helper.new_district(self.buildings, max_workers=1)
+        self.assertEqual(
+            {k: (s.email, s.homeroom) for k, s in serial.students.items()},
+            {k: (s.email, s.homeroom) for k, s in self.helper.students.items()}
+        )
+        self.assertEqual(list(serial.homerooms), list(self.helper.homerooms))
+        self.assertEqual(serial.duplicate_students, self.helper.duplicate_students)
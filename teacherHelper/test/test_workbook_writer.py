@@ -0,0 +1,80 @@
+import io
+
+from openpyxl import load_workbook
+
+from . import SyntheticRosterTestCase
+from ..tools.synthetic_zoom import synthetic_meeting_set
+from ..zoom_attendance_report import WorkbookWriter
+
+
+def sheet_contents(workbook):
+    """
+    {title: [row, ...]}, where each row is a tuple of the (column, value,
+    font size, bold, fill color) of each cell that has a value or a fill.
+    """
+    return {
+        sheet.title: [
+            tuple(
+                (
+                    cell.column,
+                    cell.value,
+                    cell.font.sz,
+                    cell.font.b,
+                    cell.fill.fgColor.rgb if cell.fill.fill_type else None,
+                )
+                for cell in row
+                if cell.value is not None or cell.fill.fill_type
+            )
+            for row in sheet.iter_rows()
+        ]
+        for sheet in workbook.worksheets
+    }
+
+
+class TestWorkbookWriter(SyntheticRosterTestCase):
+    STUDENTS = 60
+    SEED = 8
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.meeting_set = synthetic_meeting_set(cls.helper, days=5, groups=2)
+        cls.meeting_set.meetings[0].unidentifiable = [f'Anon {i}' for i in range(25)]
+
+    def saved(self, **kw):
+        data = io.BytesIO()
+        WorkbookWriter(self.meeting_set, **kw).generate_report().save(data)
+        return load_workbook(data)
+
+    def test_write_only_workbook_has_the_same_cells(self):
+        normal = sheet_contents(self.saved())
+        write_only = sheet_contents(self.saved(write_only=True))
+        self.assertEqual(list(normal), list(write_only))
+        for title in normal:
+            self.assertEqual(len(normal[title]), len(write_only[title]))
+            # students with the same last name can come in either order
+            self.assertEqual(
+                sorted(normal[title], key=repr),
+                sorted(write_only[title], key=repr)
+            )
+
+    def test_cells_are_styled_by_name(self):
+        workbook = self.saved()
+        sheet = workbook['Attendance by Dynamic Grouping']
+        self.assertEqual(sheet['A1'].style, 'report title')
+        durations = {
+            cell.style
+            for row in sheet.iter_rows(min_col=3)
+            for cell in row
+            if isinstance(cell.value, int)
+        }
+        self.assertTrue(durations)
+        self.assertLessEqual(
+            durations,
+            {'green duration', 'yellow duration', 'red duration'}
+        )
+        # each style is registered with the workbook once
+        self.assertEqual(
+            len(workbook.named_styles),
+            len(set(workbook.named_styles))
+        )
@@ -0,0 +1,51 @@
+import os
+import tempfile
+
+from . import SyntheticRosterTestCase
+from ..tools.synthetic_zoom import synthetic_reports
+from ..zoom_aliases import cluster_names, normalize_name, ZoomAliasStore
+from ..zoom_attendance_report import MeetingSet
+
+
+class TestZoomAliases(SyntheticRosterTestCase):
+    STUDENTS = 60
+    SEED = 6
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reports = synthetic_reports(cls.helper, 4, groups=2, variant_rate=0)
+
+    def process(self, aliases=None):
+        meeting_set = MeetingSet(self.reports, aliases=aliases)
+        for _ in meeting_set.process():
+            pass
+        return meeting_set
+
+    def test_cluster_names(self):
+        self.assertEqual(normalize_name("Mom's iPad 🙂"), 'mom')
+        clusters = cluster_names([
+            'xX gamer Xx', 'xx gamer xx!!', 'XX Gamer X', "Mom's iPad", 'mom',
+            'Jo', 'Al',
+        ])
+        self.assertCountEqual(clusters, [
+            {'xX gamer Xx', 'xx gamer xx!!', 'XX Gamer X'},
+            {"Mom's iPad", 'mom'},
+            {'Jo'},
+            {'Al'},
+        ])
+
+    def test_resolved_clusters_are_skipped_by_later_runs(self):
+        cluster, = self.process().unidentifiable_clusters()
+        self.assertEqual(cluster.names, ['xX gamer Xx'])
+        self.assertEqual(len(cluster.meetings), 4)
+        self.assertEqual(cluster.groups, [0, 1])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'aliases.json')
+            store = ZoomAliasStore(path)
+            store.resolve(cluster, None)
+            store.save()
+            meeting_set = self.process(ZoomAliasStore(path))
+        self.assertEqual(meeting_set.all_unidentifiable, set())
+        self.assertEqual(meeting_set.unidentifiable_clusters(), [])
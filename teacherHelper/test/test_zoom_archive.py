@@ -0,0 +1,71 @@
+import gzip
+import io
+from pathlib import Path
+import tarfile
+import tempfile
+import unittest
+import zipfile
+
+from ..tools.zoom_archive import iter_zoom_reports
+
+
+REPORTS = {
+    f'report_{i}.csv': (
+        'Meeting ID,Topic,Start Time,End Time,User Email,Duration (Minutes),Participants\n'
+        f'12{i},Music,10/0{i + 1}/2020 12:58:31 PM,10/0{i + 1}/2020 01:45:02 PM,t@x.org,47,1\n'
+        '\n'
+        'Name (Original Name),User Email,Total Duration (Minutes),Guest\n'
+        f'Jané Doe {i},,40,No\n'
+    )
+    for i in range(3)
+}
+
+
+class TestIterZoomReports(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self, path):
+        return [stream.read() for stream in iter_zoom_reports(path)]
+
+    def test_csv_and_gzipped_csv(self):
+        path = self.directory / 'report_0.csv'
+        path.write_text(REPORTS['report_0.csv'], encoding='utf-8')
+        self.assertEqual(self.read(path), [REPORTS['report_0.csv']])
+
+        path = self.directory / 'report_0.csv.gz'
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(REPORTS['report_0.csv'])
+        self.assertEqual(self.read(path), [REPORTS['report_0.csv']])
+
+    def test_archives_and_directories(self):
+        expected = list(REPORTS.values())
+
+        zipped = self.directory / 'reports.zip'
+        with zipfile.ZipFile(zipped, 'w') as archive:
+            for name, report in REPORTS.items():
+                archive.writestr(f'october/{name}', report)
+            archive.writestr('october/notes.txt', 'not a report')
+            archive.writestr('__MACOSX/october/._report_0.csv', 'resource fork')
+
+        tarred = self.directory / 'reports.tar.gz'
+        with tarfile.open(tarred, 'w:gz') as archive:
+            for name, data in list(REPORTS.items()) + [('notes.txt', 'not a report')]:
+                data = data.encode('utf-8')
+                info = tarfile.TarInfo(f'october/{name}')
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+
+        folder = self.directory / 'folder'
+        folder.mkdir()
+        for name, report in REPORTS.items():
+            (folder / name).write_text(report, encoding='utf-8')
+        (folder / 'notes.txt').write_text('not a report')
+
+        for path in (zipped, tarred, folder):
+            self.assertEqual(self.read(path), expected, path.name)
@@ -0,0 +1,41 @@
+
+from . import SyntheticRosterTestCase
+from ..tools.synthetic_zoom import synthetic_reports
+from ..tools.zoom_fetcher import ZoomFetchError, ZoomReportFetcher
+from ..tools.zoom_stub_server import ZoomStubServer
+from ..zoom_attendance_report import MeetingSet
+
+
+class TestZoomReportFetcher(SyntheticRosterTestCase):
+    STUDENTS = 60
+    SEED = 7
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.reports = synthetic_reports(cls.helper, 6, groups=2, variant_rate=0)
+
+    def test_fetched_reports_match_downloaded_ones(self):
+        expected = MeetingSet(self.reports)
+        for _ in expected.process():
+            pass
+        # every fourth request fails, and participants come 10 to a page
+        with ZoomStubServer(self.reports, fail_every=4, page_size=10, token='t') as server:
+            fetcher = ZoomReportFetcher('t', base_url=server.url, concurrency=2, backoff=0)
+            meeting_set = MeetingSet(fetcher.iter_reports(server.meeting_ids))
+            for _ in meeting_set.process():
+                pass
+        self.assertGreater(fetcher.retried, 0)
+        self.assertLessEqual(server.max_in_flight, 2)
+        for a, b in zip(expected.meetings, meeting_set.meetings):
+            self.assertEqual(str(a), str(b))
+            self.assertEqual(a.durations, b.durations)
+            self.assertEqual(a.connections, b.connections)
+            self.assertEqual(a.unidentifiable, b.unidentifiable)
+
+    def test_errors_are_not_retried(self):
+        with ZoomStubServer(self.reports, token='t') as server:
+            fetcher = ZoomReportFetcher('wrong', base_url=server.url, backoff=0)
+            with self.assertRaises(ZoomFetchError):
+                next(fetcher.iter_reports(server.meeting_ids))
+        self.assertEqual(fetcher.retried, 0)
@@ -0,0 +1,32 @@
+from datetime import datetime
+import unittest
+
+from ..tools.zoom_report_parser import merge_intervals, parse_zoom_report
+
+
+REPORT = (
+    'Meeting ID,Topic,Start Time,End Time,User Email,Duration (Minutes),Participants\n'
+    '123,Music,10/05/2020 12:58:31 PM,10/05/2020 01:45:02 PM,t@x.org,47,3\n'
+    '\n'
+    'Name (Original Name),User Email,Join Time,Leave Time,Duration (Minutes),Guest\n'
+    'Jane Doe,,10/05/2020 01:00:00 PM,10/05/2020 01:10:00 PM,10,No\n'
+    '"Doe, Jane",,10/05/2020 01:12:00 PM,10/05/2020 01:40:30 PM,29,No\n'
+    'Jane iPad,,10/05/2020 01:30:00 PM,10/05/2020 01:45:00 PM,15,No\n'
+)
+
+
+class TestZoomReportParser(unittest.TestCase):
+
+    def test_join_and_leave_times_are_read(self):
+        topic, start, participants = parse_zoom_report(REPORT)
+        self.assertEqual((topic, start), ('Music', datetime(2020, 10, 5, 12, 58)))
+        self.assertEqual(participants[1].name, 'Doe, Jane')
+        self.assertEqual(participants[1].join, datetime(2020, 10, 5, 13, 12))
+        self.assertEqual(participants[1].leave, datetime(2020, 10, 5, 13, 40, 30))
+
+    def test_merge_intervals_counts_overlap_once(self):
+        _, _, participants = parse_zoom_report(REPORT)
+        intervals = [(p.join, p.leave) for p in reversed(participants)]
+        # 13:00-13:10, then 13:12-13:45 across two overlapping devices
+        self.assertEqual(merge_intervals(intervals), 43)
+        self.assertEqual(merge_intervals([]), 0)
@@ -0,0 +1,325 @@
+"""
+Deterministic, fake OnCourse exports for tests and benchmarks. Nothing in
+here is real student data, so it can be committed, shared, and generated at
+any size.
+
+    >>> roster = SyntheticOnCourse(10_000, seed=1)
+    >>> students_csv, guardians_csv = roster.write('/tmp/oncourse')
+    >>> helper = Helper.new_school_year(students_csv, guardians_csv)
+
+The output has the quirks of the real exports that new_school_year has to
+cope with: a byte order mark on the student export, header labels that vary
+between export templates, a summary row at the bottom, free text with
+misspellings, missing or malformed phone numbers, and households of
+siblings who share the same guardians.
+"""
+import csv
+from pathlib import Path
+import random
+
+
+FIRST_SYLLABLES = [
+    'ja', 'mi', 'so', 'ka', 'le', 'da', 'ro', 'ni', 'ma', 'el', 'a', 'ty',
+    'be', 'lu', 'cha', 'za', 'ha', 'jo', 'ri', 'se', 've', 'no', 'cal', 'em',
+]
+FIRST_ENDINGS = [
+    'son', 'la', 'ra', 'den', 'lyn', 'mir', 'na', 'ron', 'die', 'vin', 'ly',
+    'tan', 'ria', 'cob', 'lie', 'ya', 'ton', 'ah',
+]
+LAST_SYLLABLES = [
+    'mor', 'gal', 'win', 'bel', 'har', 'cas', 'tor', 'ash', 'lin', 'ver',
+    'dun', 'fen', 'kel', 'ros', 'pel', 'wal', 'bran', 'cor', 'hol', 'mar',
+    'sel', 'tan', 'ald', 'brook', 'fair', 'stan', 'rad', 'quin', 'lor', 'ev',
+]
+LAST_ENDINGS = [
+    'ley', 'ton', 'ford', 'man', 'son', 'well', 'dale', 'er', 'ez', 'ski',
+    'wood', 'berg', 'stein', 'ing', 'sen', 'lo', 'ram', 'by', 'ick', 'ova',
+]
+
+# Each column can be labelled a few different ways depending on which
+# export template was used. new_school_year matches these loosely.
+STUDENT_HEADERS = [
+    ['First Name', 'Student First Name', 'FIRST NAME'],
+    ['Last Name', 'Student Last Name', 'LAST NAME'],
+    ['Grade Level', 'Grade Level (Current)', 'Student Grade Level'],
+    ['Homeroom Teacher', 'Homeroom Teacher Name', 'HOMEROOM TEACHER'],
+    ['Email Address', 'Student Email Address', 'EMAIL ADDRESS'],
+    ['Birth Date', 'Student Birth Date', 'BIRTH DATE'],
+]
+GUARDIAN_HEADERS = [
+    ['Guardian First Name', 'GUARDIAN FIRST NAME'],
+    ['Guardian Last Name', 'GUARDIAN LAST NAME'],
+    ['Student First Name', 'STUDENT FIRST NAME'],
+    ['Student Last Name', 'STUDENT LAST NAME'],
+    ['Primary Contact', 'Primary Contact?', 'PRIMARY CONTACT'],
+    ['Guardian Email Address', 'GUARDIAN EMAIL ADDRESS'],
+    ['Guardian Mobile Phone', 'GUARDIAN MOBILE PHONE'],
+    ['Guardian Phone', 'GUARDIAN PHONE'],
+    ['Guardian Work Phone', 'GUARDIAN WORK PHONE'],
+    ['Comments', 'COMMENTS'],
+    ['Allow Contact', 'Allow Contact?', 'ALLOW CONTACT'],
+    ['Student Resides With', 'Student Resides With?', 'STUDENT RESIDES WITH'],
+    ['Relation To Student', 'Relation to Student', 'RELATION TO STUDENT'],
+]
+# columns that are in real exports, but which the helper ignores
+EXTRA_HEADERS = ['Gender', 'School Name', 'Locker Number']
+
+GRADE_FORMATS = ['{}', '0{}', 'Grade {}', '{}th Grade']
+RELATIONSHIPS = [
+    ('Mother', ['Mohter', 'mother', 'MOTHER']),
+    ('Father', ['Fahter', 'father', 'FATHER']),
+    ('Grandmother', ['Grand Mother', 'Grandmther']),
+    ('Grandfather', ['Grand Father', 'Grandfahter']),
+    ('Guardian', ['Gaurdian', 'Legal Guardian']),
+    ('Aunt', ['Aunt']),
+]
+COMMENTS = [
+    '', '', '', '', '',
+    'Prefers email',
+    'Perfers text messages',
+    'Do not call before 9am',
+    'Custody paperwork on file',
+    'Spanish speakng household',
+]
+EMAIL_DOMAINS = ['gmail.com', 'yahoo.com', 'hotmail.com', 'aol.com', 'icloud.com']
+
+
+class SyntheticOnCourse:
+    """
+    A seeded fake roster. The same (n_students, seed) always produces the
+    same rows. Student names are unique and survive str.title(), which is
+    what find_nearest_match assumes about a roster.
+
+    Rates:
+        sibling_rate        chance that a household has more than one child
+        missing_phone_rate  chance that any one phone field is unusable
+        typo_rate           chance that free text fields are misspelled
+    """
+
+    def __init__(
+            self,
+            n_students,
+            seed=0,
+            sibling_rate=0.3,
+            missing_phone_rate=0.25,
+            typo_rate=0.05,
+            grades=(4, 5, 6),
+            class_size=25,
+    ):
+        self.n_students = n_students
+        self.seed = seed
+        self.sibling_rate = sibling_rate
+        self.missing_phone_rate = missing_phone_rate
+        self.typo_rate = typo_rate
+        self.grades = grades
+        self.class_size = class_size
+
+        self.random = random.Random(seed)
+        self.first_names = [
+            (a + b).capitalize()
+            for a in FIRST_SYLLABLES for b in FIRST_ENDINGS
+        ]
+        self.last_names = [
+            (a + b).capitalize()
+            for a in LAST_SYLLABLES for b in LAST_ENDINGS
+        ]
+        # long surnames are needed for big rosters to keep names unique
+        if n_students > len(self.first_names) * len(self.last_names) // 4:
+            self.last_names += [
+                (a + b + c).capitalize()
+                for a in LAST_SYLLABLES
+                for b in LAST_SYLLABLES
+                for c in LAST_ENDINGS
+            ]
+        self.student_headers = [
+            self.random.choice(v) for v in STUDENT_HEADERS
+        ]
+        self.guardian_headers = [
+            self.random.choice(v) for v in GUARDIAN_HEADERS
+        ]
+        self.extra_header = self.random.choice(EXTRA_HEADERS)
+
+        self.students = []      # list[dict]
+        self.guardians = []     # list[dict]; one per guardian per student
+        self.households = []    # list[list[dict]]; students in the household
+        self._generate()
+
+    def _generate(self):
+        rnd = self.random
+        used_names = set()
+        homerooms = self._make_homerooms()
+        while len(self.students) < self.n_students:
+            last = rnd.choice(self.last_names)
+            n_kids = 1
+            if rnd.random() < self.sibling_rate:
+                n_kids = rnd.choice([2, 2, 2, 3, 3, 4])
+            n_kids = min(n_kids, self.n_students - len(self.students))
+            household = []
+            for _ in range(n_kids):
+                for _ in range(20):
+                    first = rnd.choice(self.first_names)
+                    if f'{first} {last}' not in used_names:
+                        break
+                else:
+                    continue
+                used_names.add(f'{first} {last}')
+                grade = rnd.choice(self.grades)
+                household.append({
+                    'first_name': first,
+                    'last_name': last,
+                    'grade_level': grade,
+                    'homeroom': rnd.choice(homerooms[grade]),
+                    'email': self._student_email(first, last),
+                    'birthday': self._birthday(grade),
+                })
+            if not household:
+                continue
+            self.students.extend(household)
+            self.households.append(household)
+            self._make_guardians(household, last)
+
+    def _make_homerooms(self):
+        """
+        Teacher names for each grade, with enough homerooms to keep classes
+        near class_size.
+        """
+        per_grade = max(1, self.n_students // len(self.grades) // self.class_size)
+        teachers = self.random.sample(
+            self.last_names,
+            min(len(self.last_names), per_grade * len(self.grades))
+        )
+        return {
+            grade: teachers[i::len(self.grades)]
+            for i, grade in enumerate(self.grades)
+        }
+
+    def _student_email(self, first, last):
+        return (
+            f'{first[0]}{last}{self.random.randint(10, 99)}'
+            '@students.example.org'
+        ).lower()
+
+    def _birthday(self, grade):
+        rnd = self.random
+        if rnd.random() < 0.01:
+            return ''
+        year = 2020 - grade - 5 - rnd.choice([0, 0, 0, 0, 1])
+        return f'{rnd.randint(1, 12):02}/{rnd.randint(1, 28):02}/{year}'
+
+    def _make_guardians(self, household, last):
+        rnd = self.random
+        n_guardians = rnd.choice([1, 2, 2, 2, 3])
+        guardians = []
+        for i in range(n_guardians):
+            relation, typos = rnd.choice(RELATIONSHIPS)
+            first = rnd.choice(self.first_names)
+            guardian_last = last if rnd.random() < 0.8 else rnd.choice(self.last_names)
+            guardians.append({
+                'first_name': first,
+                'last_name': guardian_last,
+                'primary_contact': 'Y' if i == 0 else rnd.choice(['N', 'No']),
+                'email': self._guardian_email(first, guardian_last),
+                'mobile_phone': self._phone(),
+                'home_phone': self._phone(),
+                'work_phone': self._phone(),
+                'comments': self._maybe_typo(rnd.choice(COMMENTS), []),
+                'allow_contact': rnd.choice(['Y', 'Y', 'Yes', 'N']),
+                'student_resides_with': rnd.choice(['Y', 'Y', 'Y', 'N']),
+                'relationship_to_student': self._maybe_typo(relation, typos),
+            })
+        for student in household:
+            for guardian in guardians:
+                self.guardians.append(dict(guardian, student=student))
+
+    def _guardian_email(self, first, last):
+        rnd = self.random
+        if rnd.random() < 0.1:
+            return ''
+        return (
+            f'{first}.{last}{rnd.randint(1, 999)}@{rnd.choice(EMAIL_DOMAINS)}'
+        ).lower()
+
+    def _phone(self):
+        """
+        A phone number in one of the many formats people type them in, or
+        something unusable like a blank, a placeholder, or a number with no
+        area code.
+        """
+        rnd = self.random
+        if rnd.random() < self.missing_phone_rate:
+            return rnd.choice([
+                '',
+                '',
+                '___-___-____',
+                f'{rnd.randint(200, 999)}-{rnd.randint(1000, 9999)}',
+            ])
+        area, prefix, line = (
+            rnd.randint(201, 989), rnd.randint(200, 999), rnd.randint(0, 9999)
+        )
+        return rnd.choice([
+            '({}) {}-{:04}',
+            '{}-{}-{:04}',
+            '{}.{}.{:04}',
+            '{}{}{:04}',
+            '1-{}-{}-{:04}',
+            '{}-{}-{:04} ext 12',
+        ]).format(area, prefix, line)
+
+    def _maybe_typo(self, text, typos):
+        if text and self.random.random() < self.typo_rate:
+            if typos:
+                return self.random.choice(typos)
+            i = self.random.randrange(len(text) - 1)
+            return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+        return text
+
+    def student_rows(self):
+        rows = [self.student_headers + [self.extra_header]]
+        for st in self.students:
+            rows.append([
+                st['first_name'],
+                st['last_name'],
+                self.random.choice(GRADE_FORMATS).format(st['grade_level']),
+                st['homeroom'],
+                st['email'],
+                st['birthday'],
+                '',
+            ])
+        rows.append([f'Total Records: {len(self.students)}'])
+        return rows
+
+    def guardian_rows(self):
+        rows = [self.guardian_headers]
+        for gu in self.guardians:
+            rows.append([
+                gu['first_name'],
+                gu['last_name'],
+                gu['student']['first_name'],
+                gu['student']['last_name'],
+                gu['primary_contact'],
+                gu['email'],
+                gu['mobile_phone'],
+                gu['home_phone'],
+                gu['work_phone'],
+                gu['comments'],
+                gu['allow_contact'],
+                gu['student_resides_with'],
+                gu['relationship_to_student'],
+            ])
+        rows.append([f'Total Records: {len(self.guardians)}'])
+        return rows
+
+    def write(self, directory):
+        """
+        Write students.csv and parents.csv into directory, and return their
+        paths in the order that new_school_year takes them.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        students_csv = Path(directory, 'students.csv')
+        guardians_csv = Path(directory, 'parents.csv')
+        with open(students_csv, 'w', encoding='utf-8-sig', newline='') as f:
+            csv.writer(f).writerows(self.student_rows())
+        with open(guardians_csv, 'w', encoding='utf8', newline='') as f:
+            csv.writer(f).writerows(self.guardian_rows())
+        return students_csv, guardians_csv
@@ -0,0 +1,305 @@
+"""
+Seeded, fake zoom attendance for benchmarks, built against a real roster
+(for example, one generated with SyntheticOnCourse): either processed
+MeetingSets, or the zoom report csv strings that MeetingSet reads, plus
+hard-to-match reports with answers, for measuring how well names are
+matched.
+"""
+from collections import namedtuple
+import datetime
+import random
+import string
+
+from ..zoom_attendance_report import HelperConsumer, Meeting, MeetingSet
+
+
+TOPICS = ('Music', 'Art', 'Health', 'Library', 'Gym', 'Spanish')
+
+
+def school_days(start, days):
+    """
+    The first `days` weekdays on or after start.
+    """
+    day = start
+    out = []
+    while len(out) < days:
+        if day.weekday() < 5:
+            out.append(day)
+        day += datetime.timedelta(days=1)
+    return out
+
+
+def synthetic_meeting_set(
+        helper,
+        days=180,
+        groups=6,
+        seed=0,
+        attendance_rate=0.85,
+        class_minutes=45,
+        start=datetime.date(2020, 9, 8)):
+    """
+    A processed MeetingSet for a teacher who meets with `groups` homerooms
+    once every school day for `days` days. Each student comes to each
+    meeting with probability attendance_rate, and stays for a random number
+    of minutes up to class_minutes.
+
+    Meetings are built directly, without reading or matching any zoom
+    reports, so this is fast enough for a full year at any roster size.
+    Helper is assigned to HelperConsumer.helper.
+    """
+    HelperConsumer.helper = helper
+    rnd = random.Random(seed)
+    homerooms = sorted(
+        helper.homerooms.values(),
+        key=lambda h: (h.grade_level, h.teacher)
+    )[:groups]
+    meeting_set = MeetingSet([])
+    for day in school_days(start, days):
+        for i, homeroom in enumerate(homerooms):
+            meeting = Meeting(None)
+            meeting.topic = TOPICS[i % len(TOPICS)]
+            meeting.datetime = datetime.datetime.combine(
+                day,
+                datetime.time(8 + i % 8, 30)
+            )
+            meeting.attendees = [
+                st for st in homeroom.students if rnd.random() < attendance_rate
+            ]
+            meeting.durations = {
+                st: rnd.randint(1, class_minutes) for st in meeting.attendees
+            }
+            meeting.connections = dict.fromkeys(meeting.attendees, 1)
+            meeting_set._add_meeting(meeting)  # pylint: disable=protected-access
+    meeting_set.is_processed = True
+    return meeting_set
+
+
+def _report_name(rnd, student, variant_rate):
+    """
+    The student's name, or with probability variant_rate, one of the other
+    kinds of names students show up to zoom with.
+    """
+    if rnd.random() >= variant_rate:
+        return student.name
+    return rnd.choice((
+        student.name.lower(),
+        f'{student.last_name}, {student.first_name}',
+        f'{student.first_name} {student.last_name[0]}',
+        student.first_name,
+    ))
+
+
+def _schedule(helper, n, groups, start):
+    """
+    (number, homeroom, topic, start datetime) of each of n meetings with
+    `groups` homerooms, one after another every school day.
+    """
+    homerooms = sorted(
+        helper.homerooms.values(),
+        key=lambda h: (h.grade_level, h.teacher)
+    )[:groups]
+    days = school_days(start, n // len(homerooms) + 1)
+    for i in range(n):
+        slot = i % len(homerooms)
+        begin = datetime.datetime.combine(
+            days[i // len(homerooms)],
+            datetime.time(8 + slot % 8, 30)
+        )
+        yield i, homerooms[slot], TOPICS[slot % len(TOPICS)], begin
+
+
+def _report_csv(rnd, number, topic, begin, class_minutes, invited, participants, rejoin_rate):
+    """
+    A zoom report with join and leave times for participants, a list of
+    (name, minutes). Each participant drops and rejoins once with
+    probability rejoin_rate.
+    """
+    time_format = '%m/%d/%Y %I:%M:%S %p'
+    end = begin + datetime.timedelta(minutes=class_minutes)
+    lines = [
+        'Meeting ID,Topic,Start Time,End Time,User Email,'
+        'Duration (Minutes),Participants',
+        f'{number},{topic},'
+        f'{begin.strftime(time_format)},{end.strftime(time_format)},'
+        f'teacher@example.org,{class_minutes},{invited}',
+        '',
+        'Name (Original Name),User Email,Join Time,Leave Time,'
+        'Duration (Minutes),Guest',
+    ]
+    for name, minutes in participants:
+        stints = [minutes]
+        if minutes > 2 and rnd.random() < rejoin_rate:
+            first = rnd.randint(1, minutes - 1)
+            stints = [first, minutes - first]
+        joined = begin
+        for stint in stints:
+            left = joined + datetime.timedelta(minutes=stint)
+            name = name.replace('"', '""')
+            lines.append(
+                f'"{name}",,{joined.strftime(time_format)},'
+                f'{left.strftime(time_format)},{stint},No'
+            )
+            joined = left + datetime.timedelta(minutes=1)
+    return '\n'.join(lines) + '\n'
+
+
+def synthetic_reports(
+        helper,
+        n,
+        groups=6,
+        seed=0,
+        attendance_rate=0.85,
+        variant_rate=0.1,
+        rejoin_rate=0.1,
+        class_minutes=45,
+        start=datetime.date(2020, 9, 8)):
+    """
+    n zoom attendance reports (csv strings, as downloaded from zoom) for a
+    teacher who meets with `groups` homerooms once every school day. Each
+    student comes with probability attendance_rate, under a variation of
+    their name with probability variant_rate, and drops and rejoins with
+    probability rejoin_rate. Every report also has a participant that doesn't match
+    anyone.
+    """
+    rnd = random.Random(seed)
+    reports = []
+    for i, homeroom, topic, begin in _schedule(helper, n, groups, start):
+        participants = [
+            (_report_name(rnd, st, variant_rate), rnd.randint(1, class_minutes))
+            for st in homeroom.students
+            if rnd.random() < attendance_rate
+        ]
+        participants.append(('xX gamer Xx', rnd.randint(1, 5)))
+        reports.append(_report_csv(
+            rnd,
+            i,
+            topic,
+            begin,
+            class_minutes,
+            len(homeroom.students),
+            participants,
+            rejoin_rate
+        ))
+    return reports
+
+
+# how often each kind of name turns up in adversarial_reports
+NAME_KINDS = {
+    'exact': 0.45,
+    'typo': 0.1,
+    'nickname': 0.08,
+    'first name': 0.08,
+    'emoji': 0.08,
+    'device': 0.08,
+    'parent': 0.08,
+    'last, first': 0.05,
+}
+EMOJI = ('🦄', '⚽', '😎', '🌈', '🐱', '⭐', 'ω')
+STRANGERS = ('Zoom User', 'Guest', 'iPhone', 'Co-Teacher', 'xX gamer Xx', 'Grandma')
+
+AdversarialReport = namedtuple('AdversarialReport', [
+    'csv',          # the report
+    'attendees',    # {student_id: kind of name they joined with}
+    'strangers',    # names in the report that aren't students
+])
+
+
+def _typo(rnd, name):
+    """
+    One dropped, doubled, swapped, or wrong letter.
+    """
+    letters = [i for i, c in enumerate(name) if c.isalpha()]
+    i = rnd.choice(letters)
+    edit = rnd.randrange(4)
+    if edit == 0:
+        return name[:i] + name[i + 1:]
+    if edit == 1:
+        return name[:i] + name[i] + name[i:]
+    if edit == 2 and i + 1 < len(name) and name[i + 1].isalpha():
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    return name[:i] + rnd.choice(string.ascii_lowercase) + name[i + 1:]
+
+
+def _adversarial_name(rnd, student, kind):
+    first, last = student.first_name, student.last_name
+    if kind == 'typo':
+        return _typo(rnd, student.name)
+    if kind == 'nickname':
+        nickname = first[:rnd.choice((3, 4))].rstrip('aeiou') or first[:3]
+        return f'{nickname}{rnd.choice(("", "y", "ie"))} {last}'
+    if kind == 'first name':
+        return rnd.choice((first, first.lower(), first.upper()))
+    if kind == 'emoji':
+        emoji = rnd.choice(EMOJI)
+        return rnd.choice((f'{student.name} {emoji}', f'{emoji}{student.name}{emoji}'))
+    if kind == 'device':
+        return rnd.choice((
+            f"{first}'s iPad",
+            f"{student.name}'s iPhone",
+            f'{first} {last} (Chromebook)',
+            f'iPad de {first}',
+        ))
+    if kind == 'parent' and student.guardians:
+        return rnd.choice(student.guardians).name
+    if kind == 'last, first':
+        return f'{last}, {first}'
+    return student.name
+
+
+def adversarial_reports(
+        helper,
+        n,
+        groups=6,
+        seed=0,
+        attendance_rate=0.85,
+        kinds=None,
+        strangers=2,
+        rejoin_rate=0.1,
+        class_minutes=45,
+        start=datetime.date(2020, 9, 8)):
+    """
+    Like synthetic_reports, but the reports are hard to match, and come
+    with the answers: a list of AdversarialReport. Students show up under
+    the kinds of names in `kinds` (default NAME_KINDS), a {kind: weight}
+    dict: typos, nicknames, first names only, emoji, devices ("Jane's
+    iPad"), their parent's name, and so on. Each report also has up to
+    `strangers` participants who aren't students at all.
+    """
+    kinds = kinds or NAME_KINDS
+    rnd = random.Random(seed)
+    reports = []
+    for i, homeroom, topic, begin in _schedule(helper, n, groups, start):
+        attendees = {}
+        participants = []
+        for st in homeroom.students:
+            if rnd.random() >= attendance_rate:
+                continue
+            kind = rnd.choices(list(kinds), weights=list(kinds.values()))[0]
+            if kind == 'parent' and not st.guardians:
+                kind = 'exact'
+            attendees[st.student_id] = kind
+            participants.append((
+                _adversarial_name(rnd, st, kind),
+                rnd.randint(1, class_minutes)
+            ))
+        others = rnd.sample(STRANGERS, rnd.randint(0, strangers))
+        for name in others:
+            participants.insert(
+                rnd.randint(0, len(participants)),
+                (name, rnd.randint(1, class_minutes))
+            )
+        reports.append(AdversarialReport(
+            _report_csv(
+                rnd,
+                i,
+                topic,
+                begin,
+                class_minutes,
+                len(homeroom.students),
+                participants,
+                rejoin_rate
+            ),
+            attendees,
+            others,
+        ))
+    return reports
@@ -0,0 +1,19 @@
+from time import perf_counter
+
+
+class StageTimer:
+    """
+    Lap timer for breaking a long function down into stages. Call
+    lap('stage name') at the end of each stage; time spent since the last
+    lap is added to self.timings['stage name'] (in seconds), so a stage can
+    be lapped more than once.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self._last = perf_counter()
+
+    def lap(self, stage):
+        now = perf_counter()
+        self.timings[stage] = self.timings.get(stage, 0) + now - self._last
+        self._last = now
@@ -0,0 +1,76 @@
+"""
+Read zoom reports straight out of the archives they're kept in, one at a
+time, without extracting anything to disk:
+
+    meeting_set = MeetingSet(iter_zoom_reports('data/october.zip'))
+    for meeting in meeting_set.process():
+        ...
+
+Each report is yielded as a text stream that is only open until the next
+report is asked for, which is how MeetingSet.process uses them; only one
+report is ever decompressed at a time.
+"""
+import gzip
+import io
+from pathlib import Path
+import tarfile
+import zipfile
+
+
+def _is_report(name):
+    name = Path(name).name
+    return name.lower().endswith('.csv') and not name.startswith('.')
+
+
+def _text(raw):
+    return io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+
+
+def _iter_zip(path):
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or not _is_report(info.filename):
+                continue
+            with _text(archive.open(info)) as stream:
+                yield stream
+
+
+def _iter_tar(path):
+    # 'r|*' reads the (optionally compressed) tar as a stream, member by
+    # member, rather than seeking around for an index first. Members of a
+    # streamed tar can't be wrapped for decoding, so each report is read
+    # into memory on its own.
+    with tarfile.open(path, 'r|*') as archive:
+        for member in archive:
+            if not member.isfile() or not _is_report(member.name):
+                continue
+            raw = io.BytesIO(archive.extractfile(member).read())
+            with _text(raw) as stream:
+                yield stream
+
+
+def iter_zoom_reports(path):
+    """
+    Yield a text stream for each zoom report (.csv) at path, which can be:
+
+        - a csv file
+        - a gzipped csv file (.csv.gz)
+        - a zip file
+        - a tar file, optionally compressed (.tar, .tar.gz, .tgz, ...)
+        - a directory of any of the above, read in name order
+    """
+    path = Path(path)
+    name = path.name.lower()
+    if path.is_dir():
+        for child in sorted(path.iterdir()):
+            yield from iter_zoom_reports(child)
+    elif _is_report(name):
+        with open(path, 'r', encoding='utf-8-sig', newline='') as stream:
+            yield stream
+    elif name.endswith('.csv.gz'):
+        with gzip.open(path, 'rt', encoding='utf-8-sig', newline='') as stream:
+            yield stream
+    elif zipfile.is_zipfile(path):
+        yield from _iter_zip(path)
+    elif tarfile.is_tarfile(path):
+        yield from _iter_tar(path)
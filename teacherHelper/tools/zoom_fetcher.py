@@ -0,0 +1,303 @@
+"""
+Download past-meeting participant reports from the zoom REST API, instead
+of exporting each one from the zoom website by hand:
+
+    fetcher = ZoomReportFetcher(token)
+    ids = fetcher.meeting_ids(date(2020, 9, 8), date(2020, 10, 30))
+    meeting_set = MeetingSet(fetcher.iter_reports(ids))
+    for meeting in meeting_set.process():
+        ...
+
+Requests are made with asyncio, at most `concurrency` at a time, and
+retried with exponential backoff when zoom is rate limiting (429) or having
+trouble (5xx, or no response). Each report is turned into the same csv text
+that the zoom website exports, with join and leave times, so the rest of
+teacherHelper can't tell the difference.
+
+Reports come out in the order their ids went in. Only `concurrency`
+reports are fetched ahead of the one being read, so a slow consumer (like
+MeetingSet matching names) holds the downloads back instead of piling
+reports up in memory.
+
+tools/zoom_stub_server.py serves canned reports in the same shape, for
+tests and benchmarks.
+"""
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import datetime
+import io
+import json
+import logging
+import math
+import random
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote, urlencode
+from urllib.request import Request, urlopen
+
+
+logger = logging.getLogger(__name__)
+
+ZOOM_API = 'https://api.zoom.us/v2'
+
+# same as the csv export from the zoom website
+TIME_FORMAT = '%m/%d/%Y %I:%M:%S %p'
+
+
+class ZoomFetchError(Exception):
+    """
+    A report could not be fetched, even after retrying.
+    """
+
+
+def _local_time(timestamp):
+    """
+    The API speaks UTC ("2020-10-05T16:58:31Z"); exported reports are in
+    local time.
+    """
+    utc = datetime.datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    return utc.astimezone().replace(tzinfo=None)
+
+
+def report_csv(meeting, participants) -> str:
+    """
+    Render a meeting and its participants, as returned by the report API,
+    as the csv that the zoom website exports with "show meeting information"
+    checked and "show unique users" unchecked.
+    """
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow([
+        'Meeting ID', 'Topic', 'Start Time', 'End Time', 'User Email',
+        'Duration (Minutes)', 'Participants',
+    ])
+    writer.writerow([
+        meeting.get('id', ''),
+        meeting.get('topic', ''),
+        _local_time(meeting['start_time']).strftime(TIME_FORMAT),
+        _local_time(meeting['end_time']).strftime(TIME_FORMAT)
+        if meeting.get('end_time') else '',
+        meeting.get('user_email', ''),
+        meeting.get('duration', ''),
+        meeting.get('participants_count', len(participants)),
+    ])
+    writer.writerow([])
+    writer.writerow([
+        'Name (Original Name)', 'User Email', 'Join Time', 'Leave Time',
+        'Duration (Minutes)', 'Guest',
+    ])
+    for participant in participants:
+        writer.writerow([
+            participant.get('name', ''),
+            participant.get('user_email', ''),
+            _local_time(participant['join_time']).strftime(TIME_FORMAT),
+            _local_time(participant['leave_time']).strftime(TIME_FORMAT),
+            math.ceil(participant.get('duration', 0) / 60),  # seconds
+            'No' if participant.get('user_id') else 'Yes',
+        ])
+    return out.getvalue()
+
+
+def _meeting_path(meeting_id):
+    """
+    Meeting UUIDs that start with, or contain, "/" have to be encoded twice.
+    """
+    meeting_id = str(meeting_id)
+    encoded = quote(meeting_id, safe='')
+    if meeting_id.startswith('/') or '//' in meeting_id:
+        encoded = quote(encoded, safe='')
+    return encoded
+
+
+class ZoomReportFetcher:
+    """
+    Fetch participant reports with an OAuth (or JWT) access token. base_url
+    can point at a ZoomStubServer instead of zoom.
+    """
+
+    RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+    def __init__(
+            self,
+            token=None,
+            base_url=ZOOM_API,
+            concurrency=4,
+            retries=4,
+            backoff=1.0,
+            timeout=30):
+        self.token = token
+        self.base_url = base_url.rstrip('/')
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff          # seconds; doubled on each retry
+        self.timeout = timeout
+        self.requests = 0               # including retries
+        self.retried = 0
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    def _limit(self):
+        """
+        The semaphore that keeps at most self.concurrency requests going on
+        the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _run(self, coroutine):
+        """
+        Run coroutine on a new event loop with a thread for each concurrent
+        request, since urllib blocks.
+        """
+        loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(self.concurrency)
+        loop.set_default_executor(executor)
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            executor.shutdown()
+            loop.close()
+
+    def _get(self, path, params=None):
+        """
+        Blocking GET of base_url + path, returning decoded JSON. Run in an
+        executor thread.
+        """
+        url = self.base_url + path
+        if params:
+            url += '?' + urlencode(params)
+        request = Request(url, headers={'Accept': 'application/json'})
+        if self.token:
+            request.add_header('Authorization', f'Bearer {self.token}')
+        with urlopen(request, timeout=self.timeout) as response:
+            return json.load(response)
+
+    async def get(self, path, params=None):
+        """
+        GET with retries. Rate limiting (429), server errors, and network
+        errors are retried after backoff * 2 ** attempt seconds, with some
+        jitter, or after the Retry-After header if zoom sends one. Anything
+        else, or running out of retries, raises ZoomFetchError.
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._limit():
+                    self.requests += 1
+                    return await loop.run_in_executor(
+                        None,
+                        self._get,
+                        path,
+                        params
+                    )
+            except HTTPError as e:
+                if e.code not in self.RETRY_STATUSES or attempt == self.retries:
+                    raise ZoomFetchError(f'GET {path}: {e.code} {e.reason}') from e
+                delay = e.headers.get('Retry-After')
+                delay = float(delay) if delay else None
+                reason = e.code
+            except (URLError, OSError) as e:  # includes timeouts
+                if attempt == self.retries:
+                    raise ZoomFetchError(f'GET {path}: {e}') from e
+                delay = None
+                reason = e
+            if delay is None:
+                delay = self.backoff * 2 ** attempt * random.uniform(0.5, 1)
+            self.retried += 1
+            logger.info(f'GET {path} failed ({reason}); retrying in {delay:.2f}s')
+            await asyncio.sleep(delay)
+        raise AssertionError('unreachable')
+
+    async def _paged(self, path, key, params=None):
+        """
+        Every item under key, following next_page_token.
+        """
+        params = dict(params or {}, page_size=300)
+        items = []
+        while True:
+            page = await self.get(path, params)
+            items.extend(page.get(key, []))
+            if not (token := page.get('next_page_token')):
+                return items
+            params['next_page_token'] = token
+
+    async def fetch_report(self, meeting_id) -> str:
+        """
+        The participant report for one past meeting, as csv text.
+        """
+        path = f'/report/meetings/{_meeting_path(meeting_id)}'
+        meeting, participants = await asyncio.gather(
+            self.get(path),
+            self._paged(path + '/participants', 'participants'),
+        )
+        return report_csv(meeting, participants)
+
+    async def fetch_meeting_ids(self, start, end, user='me'):
+        """
+        UUIDs of the user's meetings from start through end (dates), oldest
+        first. UUIDs rather than meeting ids, since a recurring meeting
+        keeps its id.
+        """
+        meetings = await self._paged(
+            f'/report/users/{quote(user, safe="")}/meetings',
+            'meetings',
+            {'from': start.isoformat(), 'to': end.isoformat()},
+        )
+        meetings.sort(key=lambda m: m['start_time'])
+        return [m['uuid'] for m in meetings]
+
+    async def fetch_reports(self, meeting_ids):
+        """
+        Async generator of reports (csv text), in the order of meeting_ids,
+        with at most self.concurrency reports being fetched at a time.
+        Fetching only continues as reports are taken, so meeting_ids can be
+        a lazy iterator of any length.
+        """
+        ids = iter(meeting_ids)
+        pending = deque()
+        try:
+            while True:
+                while len(pending) < self.concurrency:
+                    if (meeting_id := next(ids, None)) is None:
+                        break
+                    pending.append(
+                        asyncio.ensure_future(self.fetch_report(meeting_id))
+                    )
+                if not pending:
+                    return
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def meeting_ids(self, start, end, user='me'):
+        """
+        Blocking version of fetch_meeting_ids.
+        """
+        return self._run(self.fetch_meeting_ids(start, end, user))
+
+    def iter_reports(self, meeting_ids):
+        """
+        Blocking iterator over fetch_reports, to pass straight to MeetingSet.
+        Downloads run on their own event loop, and the requests already
+        started keep going in the background while each report is read.
+        """
+        loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(self.concurrency)
+        loop.set_default_executor(executor)
+        reports = self.fetch_reports(meeting_ids)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(reports.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(reports.aclose())
+            executor.shutdown()
+            loop.close()
@@ -0,0 +1,169 @@
+"""
+Single pass reader for zoom participant reports, exported with the "show
+meeting information" box checked. The layout is:
+
+    row 0   meeting header (Meeting ID, Topic, Start Time, ...)
+    row 1   meeting information
+    row 2   blank
+    row 3   participant header (Name (Original Name), User Email, ...)
+    row 4+  one row per participant
+
+The report is read with the csv module straight from its source, so quoted
+display names with commas in them survive, and no copy of the raw text is
+kept around after parsing.
+
+If the report has join and leave time columns ("show unique users" was not
+checked), someone who dropped and rejoined has a row for each connection;
+merge_intervals adds those up without counting overlaps twice.
+"""
+from collections import namedtuple
+import csv
+import datetime
+import io
+import math
+import os
+import re
+
+
+class ZoomReportFormatIncorrect(Exception):
+    """
+    Raised by Meeting when the user apparently didn't check the boxes they
+    needed to check when generating the report.
+
+    """
+
+
+ZoomReport = namedtuple('ZoomReport', ['topic', 'datetime', 'participants'])
+Participant = namedtuple(
+    'Participant',
+    ['name', 'duration', 'join', 'leave'],
+    defaults=(None, None)  # only in reports with join and leave times
+)
+
+
+def open_report(source):
+    """
+    Return a text stream for any kind of report source: the csv text itself
+    (str), raw bytes, a path, or an open text or binary file.
+    """
+    if isinstance(source, str):
+        return io.StringIO(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.TextIOWrapper(io.BytesIO(source), encoding='utf-8-sig')
+    if isinstance(source, os.PathLike):
+        return open(source, 'r', encoding='utf-8-sig', newline='')
+    if isinstance(source, io.TextIOBase):
+        return source
+    return io.TextIOWrapper(source, encoding='utf-8-sig')
+
+
+def parse_time(time_str):
+    """
+    Zoom times look like "10/05/2020 09:58:31 AM".
+    """
+    (
+        month,
+        day,
+        year,
+        hour,
+        minute,
+        *rest
+    ) = [int(i) for i in re.split(r'/| |:', time_str) if i.isdigit()]
+    if 'pm' in time_str.lower() and hour < 12:
+        hour += 12
+    elif 'am' in time_str.lower() and hour == 12:
+        hour = 0
+    return datetime.datetime(year, month, day, hour, minute, *rest[:1])
+
+
+def parse_start_time(time_str):
+    """
+    Meeting start times are only kept to the minute.
+    """
+    return parse_time(time_str).replace(second=0)
+
+
+def merge_intervals(intervals) -> int:
+    """
+    Total minutes covered by a list of (join, leave) datetimes, counting
+    time covered by overlapping intervals (two devices at once) only once.
+    Intervals are sorted by join time and swept once; rows in a zoom report
+    are already in join order, so the sort is linear in practice. Like
+    zoom's own durations, partial minutes are rounded up.
+    """
+    seconds = 0
+    start = end = None
+    for join, leave in sorted(intervals):
+        if end is None or join > end:
+            if end is not None:
+                seconds += (end - start).total_seconds()
+            start, end = join, leave
+        elif leave > end:
+            end = leave
+    if end is not None:
+        seconds += (end - start).total_seconds()
+    return math.ceil(seconds / 60)
+
+
+def _column(header, label, default):
+    for i, value in enumerate(header):
+        if label in value.lower():
+            return i
+    return default
+
+
+def parse_zoom_report(source) -> ZoomReport:
+    """
+    Read a zoom report in one pass. Returns a ZoomReport of the topic, the
+    start datetime, and a list of (name, duration, join, leave) Participant
+    records in the order they appear in the report. join and leave are None
+    if the report doesn't have them.
+    """
+    stream = open_report(source)
+    try:
+        reader = csv.reader(stream)
+        meeting_header = next(reader, [])
+        meeting_info = next(reader, [])
+        separator = next(reader, None)
+
+        # raise an exception if row 2 is not blank.
+        # tolerate the case of row[2] = ['', '', '', ...]
+        if separator is None or any(separator) or len(meeting_info) < 3:
+            raise ZoomReportFormatIncorrect(
+                'Zoom report must contain meeting information. The report '
+                f'beginning with {meeting_header} does not appear to contain '
+                'meeting information.'
+            )
+        topic = meeting_info[_column(meeting_header, 'topic', 1)]
+        start_time = parse_start_time(
+            meeting_info[_column(meeting_header, 'start time', 2)]
+        )
+
+        participant_header = next(reader, [])
+        duration_col = _column(participant_header, 'duration', 2)
+        join_col = _column(participant_header, 'join time', None)
+        leave_col = _column(participant_header, 'leave time', None)
+        if join_col is None or leave_col is None:
+            participants = [
+                Participant(row[0], int(row[duration_col]))
+                for row in reader
+                if row and row[0]
+            ]
+        else:
+            participants = [
+                Participant(
+                    row[0],
+                    int(row[duration_col]),
+                    parse_time(row[join_col]),
+                    parse_time(row[leave_col])
+                )
+                for row in reader
+                if row and row[0]
+            ]
+    finally:
+        if stream is not source:
+            if isinstance(source, io.IOBase):
+                stream.detach()  # leave the caller's file open
+            else:
+                stream.close()
+    return ZoomReport(topic, start_time, participants)
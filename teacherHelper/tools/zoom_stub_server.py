@@ -0,0 +1,192 @@
+"""
+A local stand-in for the parts of the zoom report API that
+tools.zoom_fetcher.ZoomReportFetcher uses, serving canned reports, so that
+fetching can be tested and benchmarked offline:
+
+    reports = synthetic_reports(helper, 100)
+    with ZoomStubServer(reports, latency=0.05) as server:
+        fetcher = ZoomReportFetcher(base_url=server.url)
+        meeting_set = MeetingSet(fetcher.iter_reports(server.meeting_ids))
+
+Each request can be slowed down by `latency` seconds, and every
+`fail_every`th request fails (alternately with 429 and 503) to exercise
+retries. The server counts requests, and the most it had going at once.
+"""
+import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+from urllib.parse import parse_qs, unquote, urlparse
+
+from .zoom_report_parser import parse_zoom_report
+
+
+def _utc(local):
+    return local.astimezone(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def report_json(source, uuid):
+    """
+    A zoom report (csv) as the (meeting, participants) the report API
+    would return for it. Reports without join and leave times are given
+    connections that start with the meeting.
+    """
+    topic, start, rows = parse_zoom_report(source)
+    participants = []
+    for i, row in enumerate(rows):
+        join = row.join or start
+        leave = row.leave or join + datetime.timedelta(minutes=row.duration)
+        participants.append({
+            'id': f'p{i}',
+            'user_id': str(i),
+            'name': row.name,
+            'user_email': '',
+            'join_time': _utc(join),
+            'leave_time': _utc(leave),
+            'duration': int((leave - join).total_seconds()),
+        })
+    end = max((p['leave_time'] for p in participants), default=_utc(start))
+    meeting = {
+        'uuid': uuid,
+        'id': uuid,
+        'topic': topic,
+        'start_time': _utc(start),
+        'end_time': end,
+        'duration': max((r.duration for r in rows), default=0),
+        'user_email': 'teacher@example.org',
+        'participants_count': len(participants),
+    }
+    return meeting, participants
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        stub = self.server.stub
+        number = stub.enter()
+        try:
+            if stub.latency:
+                time.sleep(stub.latency)
+            status, body, headers = stub.respond(self.path, self.headers, number)
+        finally:
+            stub.leave()
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        data = json.dumps(body).encode()
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *a, **kw):  # pylint: disable=arguments-differ
+        pass
+
+
+class ZoomStubServer:
+    """
+    Serve reports (csv text, or anything else parse_zoom_report reads) on
+    an open port of 127.0.0.1, as meetings with the UUIDs in
+    self.meeting_ids, in order. If token is given, requests without it get
+    a 401.
+    """
+
+    def __init__(self, reports, latency=0.0, fail_every=0, page_size=None, token=None):
+        self.meetings = {}
+        for i, report in enumerate(reports):
+            uuid = f'stub-{i}'
+            self.meetings[uuid] = report_json(report, uuid)
+        self.meeting_ids = list(self.meetings)
+        self.latency = latency
+        self.fail_every = fail_every
+        self.page_size = page_size  # overrides the page_size asked for
+        self.token = token
+
+        self.requests = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *a, **kw):
+        self.stop()
+
+    def enter(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            return self.requests
+
+    def leave(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def respond(self, path, headers, number=1):
+        """
+        (status, json body, extra headers) for a GET of path, the number'th
+        request.
+        """
+        if self.token and headers.get('Authorization') != f'Bearer {self.token}':
+            return 401, {'code': 124, 'message': 'Invalid access token.'}, {}
+        if self.fail_every and number % self.fail_every == 0:
+            with self._lock:
+                self.failures += 1
+                failures = self.failures
+            if failures % 2:
+                return 429, {'code': 429, 'message': 'Too many requests.'}, {'Retry-After': '0'}
+            return 503, {'code': 503, 'message': 'Service unavailable.'}, {}
+
+        url = urlparse(path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        parts = [unquote(unquote(p)) for p in url.path.strip('/').split('/')]
+        if parts[:2] == ['report', 'meetings'] and len(parts) in (3, 4):
+            if parts[2] not in self.meetings:
+                return 404, {'code': 3001, 'message': 'Meeting does not exist.'}, {}
+            meeting, participants = self.meetings[parts[2]]
+            if len(parts) == 3:
+                return 200, meeting, {}
+            if parts[3] == 'participants':
+                return 200, self._page('participants', participants, query), {}
+        if parts[:2] == ['report', 'users'] and parts[3:] == ['meetings']:
+            since, until = query.get('from', ''), query.get('to', '') + '~'
+            meetings = [
+                m for m, _ in self.meetings.values()
+                if since <= m['start_time'] <= until
+            ]
+            return 200, self._page('meetings', meetings, query), {}
+        return 404, {'code': 404, 'message': 'Not found.'}, {}
+
+    def _page(self, key, items, query):
+        size = self.page_size or int(query.get('page_size', 30))
+        offset = int(query.get('next_page_token') or 0)
+        return {
+            'page_size': size,
+            'total_records': len(items),
+            'next_page_token': str(offset + size) if offset + size < len(items) else '',
+            key: items[offset:offset + size],
+        }
@@ -0,0 +1,148 @@
+"""
+Zoom names that couldn't be matched to a student tend to come back, as the
+same handle or small variations of it, meeting after meeting. This module
+clusters them so that each cluster only has to be resolved once, and keeps
+those resolutions in an alias store that MeetingSet consults before it
+falls back to fuzzy matching.
+
+    aliases = ZoomAliasStore('data/zoom_aliases.json')
+    meeting_set = MeetingSet(reports, aliases=aliases)
+    ...
+    for cluster in meeting_set.unidentifiable_clusters():
+        aliases.resolve(cluster, student)  # or None: not a student
+    aliases.save()
+"""
+from collections import namedtuple
+import json
+from pathlib import Path
+import string
+import unicodedata
+
+
+# "Jane's iPad" is Jane
+DEVICE_WORDS = frozenset((
+    's', 'android', 'chromebook', 'galaxy', 'ipad', 'iphone', 'laptop',
+    'pc', 'phone', 'samsung',
+))
+
+UnidentifiedCluster = namedtuple('UnidentifiedCluster', [
+    'names',        # zoom names in the cluster, most meetings first
+    'meetings',     # meetings where any of them appeared, in order
+    'groups',       # sorted indices in meeting_set.groups of those meetings
+])
+
+
+def normalize_name(name: str) -> str:
+    """
+    Lowercase, without accents, punctuation, emoji, or device names, and
+    with whitespace collapsed.
+    """
+    name = unicodedata.normalize('NFKD', name)
+    name = ''.join(
+        c if c in string.ascii_letters or c.isdigit() else ' '
+        for c in name
+        if not unicodedata.combining(c)
+    )
+    words = name.lower().split()
+    return ' '.join(w for w in words if w not in DEVICE_WORDS) or ' '.join(words)
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Levenshtein distance between a and b, or limit + 1 if it is more than
+    limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+def cluster_names(names, max_distance=2):
+    """
+    Group names that are the same once normalized, or whose normalized
+    forms are at most max_distance edits apart. Short names need to be
+    closer: at most one edit for every four characters. Returns a list of
+    sets of names.
+    """
+    by_form = {}
+    for name in names:
+        by_form.setdefault(normalize_name(name), set()).add(name)
+    forms = sorted(by_form, key=lambda f: (len(f), f))
+
+    parent = {f: f for f in forms}
+
+    def root(form):
+        while parent[form] != form:
+            parent[form] = parent[parent[form]]
+            form = parent[form]
+        return form
+
+    for i, a in enumerate(forms):
+        for b in forms[i + 1:]:
+            if len(b) - len(a) > max_distance:
+                break  # forms are sorted by length
+            limit = min(max_distance, len(a) // 4)
+            if edit_distance(a, b, limit) <= limit:
+                parent[root(b)] = root(a)
+
+    clusters = {}
+    for form in forms:
+        clusters.setdefault(root(form), set()).update(by_form[form])
+    return list(clusters.values())
+
+
+class ZoomAliasStore:
+    """
+    Persistent map of normalized zoom names to student ids, saved as JSON
+    at path. A name can also be resolved to None, which means it is known
+    not to be a student (a parent, a guest, the teacher's phone), and
+    meetings skip it instead of listing it as unidentifiable. Like
+    ./manual_zoom_matches.py, the file contains student names, so keep it
+    out of version control.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.aliases = {}  # normalized name: student_id or None
+        if path is not None and Path(path).exists():
+            with open(path, 'r', encoding='utf-8') as jsn:
+                self.aliases = json.load(jsn)
+
+    def __contains__(self, name):
+        return normalize_name(name) in self.aliases
+
+    def __len__(self):
+        return len(self.aliases)
+
+    def get(self, name):
+        """
+        student_id for name, or None if it isn't a student or has no alias.
+        """
+        return self.aliases.get(normalize_name(name))
+
+    def resolve(self, cluster, student):
+        """
+        Resolve every name in cluster (an UnidentifiedCluster, or any
+        iterable of names) to student, or to nobody if student is None.
+        """
+        names = cluster.names if isinstance(cluster, UnidentifiedCluster) else cluster
+        student_id = student.student_id if student is not None else None
+        for name in names:
+            self.aliases[normalize_name(name)] = student_id
+
+    def save(self):
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as jsn:
+            json.dump(self.aliases, jsn, indent=2, sort_keys=True)
@@ -1,13 +1,21 @@
+from bisect import bisect_left, insort
+from collections import deque, namedtuple
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
 from copy import copy
 import datetime
+import gzip
 import logging
+import os
 import string
 import json
 import re
+from time import perf_counter
 
 from fuzzywuzzy import process
 from openpyxl import Workbook
-from openpyxl.styles import PatternFill, Font
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, NamedStyle, PatternFill
 
 try:
     from .manual_zoom_matches import MANUAL_FIXES
@@ -22,60 +30,200 @@ except ImportError:
         return name
 
 
+from .attendance_analytics import AttendanceAnalytics
+from .attendance_store import AttendanceStore
 from .helper import Helper
+from .student import Student
+from .tools.timing import StageTimer
+from .tools.zoom_report_parser import merge_intervals, parse_zoom_report
+from .zoom_aliases import cluster_names, UnidentifiedCluster
 
 logger = logging.getLogger(__name__)
 
 
-class ZoomReportFormatIncorrect(Exception):
+class _CachedHelper:
     """
-    Raised by Meeting when the user apparently didn't check the boxes they
-    needed to check when generating the report.
-
+    Reads the cached helper the first time it is used instead of at import
+    time. Assigning HelperConsumer.helper replaces this, which is how worker
+    processes (and tests) use a roster other than the cache.
     """
 
+    def __get__(self, instance, owner):
+        HelperConsumer.helper = Helper.read_cache()
+        return HelperConsumer.helper
+
 
 class HelperConsumer:
-    helper = Helper.read_cache()
+    __slots__ = ()
+    helper = _CachedHelper()
+
+
+# Everything a worker process learned about one report, in plain data that
+# can be sent back to the parent. Students are referred to by student_id.
+MeetingResult = namedtuple('MeetingResult', [
+    'topic',
+    'datetime',
+    'attendees',
+    'durations',
+    'connections',
+    'unidentifiable',
+    'grade_level',
+    'homeroom',
+    'known_matches',
+    'timings',
+])
+
+
+def _portable_matches(known_matches):
+    """
+    Copy of a known_matches cache with students replaced by student_id.
+    """
+    portable = {}
+    for key, value in known_matches.items():
+        if isinstance(value, dict):  # subgroup-scoped cache
+            portable[key] = {k: st.student_id for k, st in value.items()}
+        else:
+            portable[key] = value.student_id
+    return portable
+
+
+def _resolve_matches(portable, students):
+    """
+    Inverse of _portable_matches, against a dict of student_id: Student.
+    """
+    known_matches = {}
+    for key, value in portable.items():
+        if isinstance(value, dict):
+            known_matches[key] = {k: students[i] for k, i in value.items()}
+        else:
+            known_matches[key] = students[value]
+    return known_matches
+
+
+def popcount(bits: int) -> int:
+    return bin(bits).count('1')
+
+
+_worker_known_matches = {}
+_worker_aliases = None
+
+
+def _init_worker(helper, known_matches, aliases=None):
+    global _worker_known_matches, _worker_aliases  # pylint: disable=global-statement
+    HelperConsumer.helper = helper
+    _worker_known_matches = known_matches
+    _worker_aliases = aliases
+
+
+def _read_report_in_worker(source) -> MeetingResult:
+    students = HelperConsumer.helper.students
+    meeting = Meeting(
+        source,
+        known_matches=_resolve_matches(_worker_known_matches, students),
+        aliases=_worker_aliases
+    )
+    meeting.read_report()
+    return MeetingResult(
+        meeting.topic,
+        meeting.datetime,
+        [st.student_id for st in meeting.attendees],
+        [(st.student_id, d) for st, d in meeting.durations.items()],
+        [(st.student_id, n) for st, n in meeting.connections.items()],
+        meeting.unidentifiable,
+        meeting.grade_level,
+        meeting.homeroom,
+        _portable_matches(meeting.known_matches),
+        meeting.timings,
+    )
 
 
 class Meeting(HelperConsumer):
     """
-    Single zoom meeting instance. Takes a string of csv data, and parses out
-    the following attributes:
+    Single zoom meeting instance. Takes the csv report as a string, bytes, a
+    path, or an open file, and parses out the following attributes:
 
     Attrs:
         - topic         str
         - datetime      datetime.datetime
         - attendees     list[teacherHelper.helperStudent]
+        - durations     dict[Student, int]; total minutes attended
+        - connections   dict[Student, int]; number of times they joined
 
     Operator overloading on these classes is inconsistent:
 
         - if self == other: they have the same datetime
         - self > other: self has more attendees.
+
+    Once the meeting is added to a MeetingSet, it is finalized: everything
+    that was only needed for matching is released, leaving the attributes
+    above, unidentifiable, and SEARCH_CONFIDENCE_THRESHOLD. Meetings are
+    slotted, so a finalized meeting is not much more than those.
     """
 
-    def __init__(self, csv_string: str, known_matches=None):
+    __slots__ = (
+        'csv_string',
+        'known_matches',
+        'aliases',
+        'SEARCH_CONFIDENCE_THRESHOLD',
+        'attendees',
+        'unidentifiable',
+        'durations',
+        'connections',
+        'datetime',
+        'topic',
+        'grade_level',
+        'homeroom',
+        'participants',
+        'timings',
+        '_matched',
+        '_rows',
+    )
+
+    def __init__(self, csv_string, known_matches=None, aliases=None):
         super().__init__()
-        self.csv_string = csv_string
+        self.csv_string = csv_string        # released after read_report
 
         # known_matches is a cache layer, passed down from MeetingSet
         self.known_matches = known_matches if known_matches else {}
+        # names resolved by hand; a zoom_aliases.ZoomAliasStore
+        self.aliases = aliases
         self.SEARCH_CONFIDENCE_THRESHOLD = 90
 
-        self.average_len_attendance = None  # int
         self.attendees = []                 # list[helper.Student]
         self.unidentifiable = []            # list[str]
+        self.durations = {}                 # dict[helper.Student, int]
+        self.connections = {}               # dict[helper.Student, int]
         self.datetime = None                # datetime.datetime
         self.topic = None                   # str
 
         # may not be assigned; only used for matching
         self.grade_level = None             # int
         self.homeroom = None                # str
-        self.rows = []                      # raw rows  list[str] (does not persist across MeetingSet serialization)
+        # Participant records; only kept while matching
+        self.participants = []
+        # seconds spent in each stage of read_report
+        self.timings = {}
 
         # first pass matches that will be skipped on the second pass
-        self._matched = []
+        self._matched = set()
+        # each matched student's Participant records, while matching
+        self._rows = {}
+
+    def finalize(self):
+        """
+        Release everything that was only needed to read and match the
+        report, most importantly the reference to the shared known_matches
+        cache.
+        """
+        self.csv_string = None
+        self.known_matches = None
+        self.aliases = None
+        self.grade_level = None
+        self.homeroom = None
+        self.participants = None
+        self.timings = None
+        self._matched = None
+        self._rows = None
 
     def __repr__(self):
         outstr = (
@@ -126,71 +274,35 @@ class Meeting(HelperConsumer):
 
     def read_report(self):
         """
-        Reads, and parses zoom report string.
+        Reads, and parses zoom report.
 
         assigns attributes:
         self.topic
         self.grade_level
         self.datetime
-        """
-        self._validate_zoom_report_format()
-        self._parse_csv()
 
-    def _validate_zoom_report_format(self):
-        """
-        Validate that the user checked the boxes they needed to to check while
-        generating the CSV
+        Names are matched in two passes: once for the easy-to-match
+        students, and again using what was learned from them (their grade
+        level or homeroom) to narrow the search for the hard-to-match ones.
+
+        The time spent parsing, on each matching pass, and adding up
+        durations is left in self.timings.
         """
-        self.rows = []
-        for line in self.csv_string.split('\n')[:-1]:
-            line = line.strip()
-            self.rows.append(line.split(','))
-        # raise an exception if row 2 is not blank.
-        # tolerate the case of row[2] = ['', '', '', ...]
-        exception_message = (
-            'Zoom report must contain meeting information. The report for '
-            f'{self.topic} at {self.datetime} does not appear to contain '
-            'meeting information.'
+        timer = StageTimer()
+        self.topic, self.datetime, self.participants = parse_zoom_report(
+            self.csv_string
         )
-        if self.rows[2]:
-            row_set = set(self.rows[2])  # this line should be blank
-            if len(row_set) <= 1:
-                if row_set.pop():
-                    raise ZoomReportFormatIncorrect(exception_message)
-            else:
-                raise ZoomReportFormatIncorrect(exception_message)
-
-    def _parse_csv(self):
-        """
-        Assuming that it's structure has been validated.
-        """
-        self._parse_csv_header()
-        self._parse_csv_body()
-
-    def _parse_csv_header(self):
-        self.topic = self.rows[1][1]
-        time_str = self.rows[1][2]
-        (
-            month,
-            day,
-            year,
-            hour,
-            minute,
-            *rest  # pylint: disable=unused-variable
-        ) = [int(i) for i in re.split(r'/| |:', time_str) if i.isdigit()]
-        if 'pm' in time_str.lower():
-            hour += 12
-        self.datetime = datetime.datetime(year, month, day, hour, minute)
+        self.csv_string = None
+        timer.lap('parse')
         logger.info(f'{"*" * 30} PARSING {self.topic} at {self.datetime.date()} {"*" * 30}')
-
-    def _parse_csv_body(self):
-        """
-        Make two passes over the data. Once for the easy-to-match students,
-        and again using data gained from the easy to match students to narrow
-        field of search for the hard to match ones.
-        """
         self._csv_parse_first_pass()
+        timer.lap('first pass')
         self._csv_parse_second_pass()
+        timer.lap('second pass')
+        self._total_durations()
+        timer.lap('durations')
+        self.participants = []
+        self.timings = timer.timings
 
     def _csv_parse_first_pass(self):
         """
@@ -200,15 +312,28 @@ class Meeting(HelperConsumer):
         logger.debug('*** First matching pass ***')
         grade_levels_within = set()
         homerooms_within = set()
-        for row in self.rows[4:]:
+        for participant in self.participants:
+            name = participant.name
+
+            # names resolved by hand in an earlier run come first
+            if self.aliases is not None and name in self.aliases:
+                if (student_id := self.aliases.get(name)) is None:
+                    self._matched.add(name)  # known not to be a student
+                    continue
+                st = self.helper.students.get(student_id)
+            else:
+                st = None
+
+            if st:
+                logger.debug(f'Alias for {st.name}')
 
             # try fetching from cache layer
-            if not (st := self.known_matches.get(row[0])):
+            elif not (st := self.known_matches.get(name)):
 
                 # if that doesn't work, use high reliability search from
                 # ./helper.Helper
                 st = self.helper.find_nearest_match(
-                    row[0],
+                    name,
                     auto_yes=True,
                     threshold=self.SEARCH_CONFIDENCE_THRESHOLD)
 
@@ -216,18 +341,15 @@ class Meeting(HelperConsumer):
                 if not st:
                     continue
 
-                self.known_matches[row[0]] = st  # put new match into cache
+                self.known_matches[name] = st  # put new match into cache
 
             else:
                 logger.debug(f'Global cache hit for {st.name}')
 
-            logger.debug(f'FIRST PASS MATCH {row[0]} == {st.name}')
+            logger.debug(f'FIRST PASS MATCH {name} == {st.name}')
 
-            st.zoom_attendance_report.setdefault(
-                self.__str__(),
-                int(row[2])  # duration of attendance
-            )
-            self._matched.append(row[0])
+            self._record_participant(st, participant)
+            self._matched.add(name)
             grade_levels_within.add(st.grade_level)
             homerooms_within.add(st.homeroom)
 
@@ -248,31 +370,80 @@ class Meeting(HelperConsumer):
 
     def _csv_parse_second_pass(self):
         """
-        Make a second pass over the data, matching within subgroup.
+        Make a second pass over the data, matching within subgroup. Each
+        name is only searched for once, however many times it rejoined.
         """
-        for row in self.rows[4:]:
+        second_pass = {}  # name: Student, or None if it couldn't be matched
+        for participant in self.participants:
+            name = participant.name
 
             # skip those we've already matched
-            if row[0] in self._matched:
+            if name in self._matched:
                 continue
 
-            logger.debug(f'Attempting to match {row[0]} on the second pass')
+            if name in second_pass:
+                st = second_pass[name]
+            else:
+                logger.debug(f'Attempting to match {name} on the second pass')
+
+                # try to match upside down, forwards and backwards
+                st = second_pass[name] = self.match_student(name)
 
-            # try to match upside down, forwards and backwards
-            st = self.match_student(row[0])
+                if not st:
+                    logger.debug(f'No match for {name}')
+                    self.unidentifiable.append(name)
 
             if not st:
-                logger.debug(f'No match for {row[0]}')
-                self.unidentifiable.append(row[0])
                 continue
 
             # It's a match!
-            logger.debug(f'SECOND PASS MATCH {row[0]} == {st.name}')
-            st.zoom_attendance_report.setdefault(
-                self.__str__(),
-                int(row[2])  # duration of attendance
-            )
+            logger.debug(f'SECOND PASS MATCH {name} == {st.name}')
+            self._record_participant(st, participant)
+
+    def _record_participant(self, st, participant):
+        """
+        Students are attendees from their first matched row, whichever pass
+        it was matched on. A student who dropped and rejoined, or joined on
+        two devices, has more than one row.
+        """
+        if st not in self._rows:
+            self._rows[st] = []
             self.attendees.append(st)
+        self._rows[st].append(participant)
+
+    def _total_durations(self):
+        """
+        Add up each student's rows into self.durations and self.connections.
+        Rows with join and leave times are merged by merge_intervals, so
+        overlapping connections are only counted once; rows without them
+        are added up. Durations are copied into the MeetingSet's
+        AttendanceStore when the meeting is added to it.
+        """
+        for st, rows in self._rows.items():
+            timed = [(p.join, p.leave) for p in rows if p.join is not None]
+            untimed = sum(p.duration for p in rows if p.join is None)
+            self.durations[st] = untimed + (merge_intervals(timed) if timed else 0)
+            self.connections[st] = len(rows)
+        self._rows = {}
+
+    @classmethod
+    def from_result(cls, result: MeetingResult, known_matches=None):
+        """
+        Rebuild a meeting that was read in another process against this
+        process's students, recording durations just like read_report.
+        """
+        students = cls.helper.students
+        self = cls(None, known_matches=known_matches)
+        self.topic = result.topic
+        self.datetime = result.datetime
+        self.unidentifiable = result.unidentifiable
+        self.grade_level = result.grade_level
+        self.homeroom = result.homeroom
+        self.attendees = [students[i] for i in result.attendees]
+        self.durations = {students[i]: d for i, d in result.durations}
+        self.connections = {students[i]: n for i, n in result.connections}
+        self.timings = result.timings
+        return self
 
     def match_student(self, name):
         """
@@ -284,6 +455,13 @@ class Meeting(HelperConsumer):
         # reference manual fixes, an optional import
         name = MANUAL_FIXES(name)
 
+        # some students join with their school email, or just its local part
+        students = [
+            e for e in self.helper.lookup_email(name) if isinstance(e, Student)
+        ]
+        if len(students) == 1:
+            return students[0]
+
         # Rough cleaning
         # some use dot to delimit first / last name
         name.replace('.', ' ')
@@ -347,7 +525,7 @@ class Meeting(HelperConsumer):
         # first, recognize that self.homeroom and self.grade_level are
         # initialized as None.
 
-        # now, self._parse_csv_body() iterates over the rows twice. On the
+        # now, self.read_report() iterates over the rows twice. On the
         # first pass, this function is NOT called. Instead,
         # teacherHelper.helper.Helper.find_nearest_match is used ONLY. The
         # reason for this is that it provides more reliable results, but
@@ -387,7 +565,7 @@ class Meeting(HelperConsumer):
         if (
             st := (
                 self._check_scoped_cache(
-                    getattr(self, compare_attr), student_name)
+                    getattr(self, compare_attr), student_name, name_part)
             )
         ):
             logger.debug(f'Subgroup-scoped cache hit for {st.name}')
@@ -440,23 +618,96 @@ class Meeting(HelperConsumer):
 
         # insert into cache, scoped to this subgroup
         self.known_matches[getattr(self, compare_attr)].setdefault(
-            student_name,
+            (name_part, student_name),
             st
         )
         return st
 
-    def _check_scoped_cache(self, cache_key, student_name):
+    def _check_scoped_cache(self, cache_key, student_name, name_part):
         """
         cache_key will be the name of the subgroup. Returns Student or
-        None.
+        None. Entries are keyed by name_part as well, so that a word matched
+        as a first name is not returned when it is searched as a last name;
+        otherwise, the result would depend on which report was read first.
         """
         scoped_cache = self.known_matches.get(cache_key)
         if not scoped_cache:
             self.known_matches[cache_key] = {}
             return
-        return scoped_cache.get(student_name)
+        return scoped_cache.get((name_part, student_name))
+
 
+class GroupingIndex:
+    """
+    Bookkeeping that lets MeetingSet.match_meeting_with_group_by_union skip
+    groups that can't possibly match.
+
+    Each meeting's attendees are reduced once to a bitset (an int) over
+    student ids, so union sizes are a bitwise or and a popcount. Two
+    meetings can only pass the union test if they share at least one
+    student (as long as the ratio adjustment is below 1), so an inverted
+    index of student -> groups gives the only candidate groups. Within a
+    group, meetings are indexed by length, so the closest meeting by length
+    is a bisect.
+    """
 
+    def __init__(self):
+        self.bits = {}            # student_id: bit position
+        self.student_groups = []  # bit position: set of group indices
+        self.by_length = []       # group index: {length: (position, signature, meeting)}
+        self.lengths = []         # group index: sorted list of lengths
+        self.sizes = []           # group index: number of meetings
+
+    def signature(self, meeting) -> int:
+        signature = 0
+        for st in meeting.attendees:
+            if (bit := self.bits.get(st.student_id)) is None:
+                bit = self.bits[st.student_id] = len(self.bits)
+                self.student_groups.append(set())
+            signature |= 1 << bit
+        return signature
+
+    def add(self, group_index, meeting, signature):
+        if group_index == len(self.sizes):
+            self.by_length.append({})
+            self.lengths.append([])
+            self.sizes.append(0)
+        by_length = self.by_length[group_index]
+        if len(meeting) not in by_length:
+            by_length[len(meeting)] = (self.sizes[group_index], signature, meeting)
+            insort(self.lengths[group_index], len(meeting))
+        self.sizes[group_index] += 1
+        for st in meeting.attendees:
+            self.student_groups[self.bits[st.student_id]].add(group_index)
+
+    def candidates(self, meeting):
+        """
+        Sorted indices of the groups that share a student with meeting.
+        """
+        groups = set()
+        for st in meeting.attendees:
+            if (bit := self.bits.get(st.student_id)) is not None:
+                groups.update(self.student_groups[bit])
+        return sorted(groups)
+
+    def closest(self, group_index, length, max_difference=100):
+        """
+        The first meeting in the group whose length is closest to length,
+        as (signature, meeting), or None if none is within max_difference.
+        """
+        lengths = self.lengths[group_index]
+        by_length = self.by_length[group_index]
+        i = bisect_left(lengths, length)
+        options = [by_length[l] for l in lengths[max(i - 1, 0):i + 1]]
+        if not options:
+            return None
+        _, signature, meeting = min(
+            options,
+            key=lambda o: (abs(len(o[2]) - length), o[0])
+        )
+        if abs(len(meeting) - length) >= max_difference:
+            return None
+        return signature, meeting
 
 
 class MeetingSet(HelperConsumer):
@@ -508,8 +759,16 @@ class MeetingSet(HelperConsumer):
     the same as the ones from the past meeting, then it's a match."
     """
 
+    SERIALIZATION_FORMAT = 'teacherHelper.MeetingSet'
+    SERIALIZATION_VERSION = 2
 
-    def __init__(self, csv_strings: list, group_map=None, trust_topics=False, known_matches=None):
+    def __init__(
+            self,
+            csv_strings: list,
+            group_map=None,
+            trust_topics=False,
+            known_matches=None,
+            aliases=None):
         super().__init__()
         self.csv_strings = csv_strings
         self.groups = []
@@ -517,6 +776,12 @@ class MeetingSet(HelperConsumer):
         self.known_matches = {}  # cache layer; can be kickstarted with starter data
         self.TOTAL_TO_UNION_RATIO_ADJUSTMENT = 0.9
         self.is_processed = False
+        self.changed_groups = set()  # indices of groups touched by add_reports
+        self._grouping_index = None  # GroupingIndex; rebuilt from self.groups
+        self.attendance = AttendanceStore()  # minutes by student and meeting
+        self.aliases = aliases  # zoom_aliases.ZoomAliasStore, checked first
+        # seconds spent in each stage of reading and grouping reports
+        self.read_timings = {}
 
         logger.info(
             'Meetingset initialized with the following known matches passed '
@@ -524,9 +789,8 @@ class MeetingSet(HelperConsumer):
             {'known_matches': known_matches}
         )
 
-        # init dict on student objects
-        for st in self.helper.students.values():
-            st.__dict__.setdefault('zoom_attendance_report', {})
+        # student ids in deserialized data that are not in the roster
+        self.missing_students = []
 
         if known_matches:
             for zoom_name, real_name in known_matches.items():
@@ -537,14 +801,143 @@ class MeetingSet(HelperConsumer):
                     )
                     self.known_matches.setdefault(zoom_name, st)
 
-    def process(self):
+    def process(self, parallel=False, max_workers=None):
         """
         Generator that produces data structure. Yields a meeting immediately
         after it has been parsed.
+
+        With parallel=True, reports are parsed and matched in a pool of
+        max_workers processes (default: one per cpu). Each worker gets a
+        copy of the roster and of the known matches once, when it starts.
+        Meetings still come back, get grouped, and are yielded in the
+        original order, and matches learned by the workers are merged back
+        into self.known_matches, so the result is the same as a serial run.
+        """
+        for meeting in self._read(self.csv_strings, parallel, max_workers):
+            self._add_meeting(meeting)
+
+            # report progress up the callstack.
+            yield meeting
+
+        self.is_processed = True
+
+    def add_reports(self, csv_strings, parallel=False, max_workers=None):
+        """
+        Add new reports to a set that has already been processed (or
+        deserialized), without reprocessing the reports that are already
+        in it. Only the new reports are parsed and matched, and each is put
+        into an existing group or a new one, just like in process().
+
+        Returns the indices in self.groups of the groups that changed, which
+        are also kept in self.changed_groups until the next call. A report
+        for a meeting that is already in the set is skipped.
+        """
+        if not self.is_processed:
+            raise Exception('Process the MeetingSet before adding reports to it.')
+        existing = {str(m) for m in self.meetings}
+        self.changed_groups = set()
+        for meeting in self._read(csv_strings, parallel, max_workers):
+            if str(meeting) in existing:
+                logger.warning(f'{meeting} is already in the MeetingSet; skipping it.')
+                continue
+            existing.add(str(meeting))
+            self.changed_groups.add(self._add_meeting(meeting))
+        return self.changed_groups
+
+    def _add_meeting(self, meeting):
+        """
+        Dynamically group meeting, and return the index of its group.
+        """
+        for stage, seconds in (meeting.timings or {}).items():
+            self.read_timings[stage] = self.read_timings.get(stage, 0) + seconds
+        meeting.finalize()
+        self.meetings.append(meeting)
+        self._record_meeting(meeting)
+        start = perf_counter()
+        index = self._group_meeting(meeting)
+        self.read_timings['grouping'] = (
+            self.read_timings.get('grouping', 0) + perf_counter() - start
+        )
+        return index
+
+    def _record_meeting(self, meeting):
+        self.attendance.record_meeting(meeting)
+        self._link_students(meeting)
+
+    def _link_students(self, meeting):
         """
-        for csv_string in self.csv_strings:
+        Point Student.zoom_attendance_report of each student at the meeting
+        at this set's attendance. Each student is linked to the last set
+        that recorded them, so making another set doesn't empty the reports
+        of the students in this one.
+        """
+        for st in meeting.durations:
+            st._attendance_store = self.attendance  # pylint: disable=protected-access
+
+    def _group_meeting(self, meeting):
+        match = self.match_meeting_with_group_by_union(meeting)
+        if match:
+            match.append(meeting)
+            index = next(i for i, g in enumerate(self.groups) if g is match)
+        else:
+            self.groups.append([meeting])
+            index = len(self.groups) - 1
+        grouping = self.grouping_index
+        grouping.add(index, meeting, grouping.signature(meeting))
+        return index
+
+    def regroup(self, ratio=None):
+        """
+        Group the meetings again from scratch, optionally with a new
+        TOTAL_TO_UNION_RATIO_ADJUSTMENT. Meetings keep their matched
+        attendees, so nothing is parsed or matched again; only the grouping
+        is redone, in the order the meetings were added. Returns the number
+        of groups.
+        """
+        if ratio is not None:
+            self.TOTAL_TO_UNION_RATIO_ADJUSTMENT = ratio
+        self.groups = []
+        self._grouping_index = None
+        self.changed_groups = set()
+        for meeting in self.meetings:
+            self._group_meeting(meeting)
+        return len(self.groups)
+
+    def sweep_ratios(self, ratios):
+        """
+        Number of groups at each TOTAL_TO_UNION_RATIO_ADJUSTMENT in ratios,
+        as {ratio: groups}, to help pick one. The set is left grouped as it
+        was.
+        """
+        original = self.TOTAL_TO_UNION_RATIO_ADJUSTMENT
+        try:
+            return {ratio: self.regroup(ratio) for ratio in ratios}
+        finally:
+            self.regroup(original)
+
+    @property
+    def grouping_index(self):
+        if self._grouping_index is None:
+            grouping = GroupingIndex()
+            for i, group in enumerate(self.groups):
+                for meeting in group:
+                    grouping.add(i, meeting, grouping.signature(meeting))
+            self._grouping_index = grouping
+        return self._grouping_index
+
+    def _read(self, csv_strings, parallel=False, max_workers=None):
+        if parallel:
+            return self._read_reports_in_parallel(csv_strings, max_workers)
+        return self._read_reports(csv_strings)
+
+    def _read_reports(self, csv_strings):
+        for csv_string in csv_strings:
             # instantiate and process meeting.
-            meeting = Meeting(csv_string, known_matches=self.known_matches)
+            meeting = Meeting(
+                csv_string,
+                known_matches=self.known_matches,
+                aliases=self.aliases
+            )
             meeting.read_report()
 
             # merge matches from meeting into the cache.
@@ -553,19 +946,52 @@ class MeetingSet(HelperConsumer):
                     zn,
                     st
                 )
-            self.meetings.append(meeting)
-
-            # dynamically group meeting
-            match = self.match_meeting_with_group_by_union(meeting)
-            if match:
-                match.append(meeting)
-            else:
-                self.groups.append([meeting])
-
-            # report progress up the callstack.
             yield meeting
 
-        self.is_processed = True
+    def _read_reports_in_parallel(self, csv_strings, max_workers=None):
+        """
+        Only a few reports per worker are in flight at a time, so
+        csv_strings can be a lazy iterator of any length.
+        """
+        max_workers = max_workers or os.cpu_count()
+        sources = iter(csv_strings)
+        pending = deque()
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(
+                self.helper,
+                _portable_matches(self.known_matches),
+                self.aliases
+            )
+        ) as executor:
+            while True:
+                while len(pending) < max_workers * 2:
+                    if (source := next(sources, None)) is None:
+                        break
+                    if hasattr(source, 'read'):  # open files can't be pickled
+                        source = source.read()
+                    pending.append(
+                        executor.submit(_read_report_in_worker, source)
+                    )
+                if not pending:
+                    break
+                result = pending.popleft().result()
+                self._merge_known_matches(result.known_matches)
+                yield Meeting.from_result(
+                    result,
+                    known_matches=self.known_matches
+                )
+
+    def _merge_known_matches(self, portable):
+        learned = _resolve_matches(portable, self.helper.students)
+        for key, value in learned.items():
+            if isinstance(value, dict):
+                scoped = self.known_matches.setdefault(key, {})
+                for name, st in value.items():
+                    scoped.setdefault(name, st)
+            else:
+                self.known_matches.setdefault(key, value)
 
     def match_meeting_with_group_by_union(self, meeting: Meeting):
         """
@@ -575,35 +1001,40 @@ class MeetingSet(HelperConsumer):
         Return the group whose union against the provided list is less than the
         length of the lists combined, indicating that these are two instances
         of the same group of students meeting.
+
+        Only the groups that self.grouping_index says could match are
+        compared, in their original order, so the result is the same as
+        comparing against every group.
         """
-        for group in self.groups:
+        grouping = self.grouping_index
+        signature = grouping.signature(meeting)
+        if self.TOTAL_TO_UNION_RATIO_ADJUSTMENT < 1:
+            candidates = grouping.candidates(meeting)
+        else:  # even disjoint meetings can match
+            candidates = range(len(self.groups))
+        for group_index in candidates:
             # select closest_meeting: the past meeting whose len() is closest
             # to the current meeting.
-            closest_meeting = None
-            smallest_difference = 100  # initialize with random large number
-            for prev_meeting in group:
-                diff = abs(len(prev_meeting) - len(meeting))
-                if diff < smallest_difference:
-                    smallest_difference = diff
-                    closest_meeting = prev_meeting
+            if not (closest := grouping.closest(group_index, len(meeting))):
+                continue
+            cm__signature, closest_meeting = closest
 
             # perform set union comparison
-            cm__attendees = {s.name for s in closest_meeting.attendees}
-            m__attendees = {s.name for s in meeting.attendees}
-            union = len(cm__attendees | m__attendees)
-            total = len(cm__attendees) + len(m__attendees)
+            union = popcount(cm__signature | signature)
+            total = popcount(cm__signature) + popcount(signature)
             total *= self.TOTAL_TO_UNION_RATIO_ADJUSTMENT
             is_matched = total > union
 
             # MATCH CRITERIA
+            # formatted lazily: regroup and sweep_ratios run this a lot
             logger.info('----------- GROUP MATCH -----------')
-            logger.info(f'Total: {total}')
-            logger.info(f'Union: {union}')
-            logger.info(f'Closest Meeting: {closest_meeting}')
-            logger.info(f'Current Meeting: {meeting}')
-            logger.info(f'Is Matched: {is_matched}')
+            logger.info('Total: %s', total)
+            logger.info('Union: %s', union)
+            logger.info('Closest Meeting: %s', closest_meeting)
+            logger.info('Current Meeting: %s', meeting)
+            logger.info('Is Matched: %s', is_matched)
             if is_matched:
-                return group
+                return self.groups[group_index]
         return []
 
     @property
@@ -617,33 +1048,130 @@ class MeetingSet(HelperConsumer):
             all_.update(m.unidentifiable)
         return all_
 
+    def unidentifiable_clusters(self, max_distance=2):
+        """
+        Unidentified names, clustered by zoom_aliases.cluster_names, as a
+        list of UnidentifiedCluster with the meetings and groups each
+        cluster appeared in, the most frequent first. Names that already
+        have an alias in self.aliases are left out, so clusters can be
+        resolved one at a time.
+        """
+        assert self.is_processed
+        group_of = {
+            id(meeting): i
+            for i, group in enumerate(self.groups)
+            for meeting in group
+        }
+        meetings_by_name = {}
+        for index, meeting in enumerate(self.meetings):
+            for name in meeting.unidentifiable:
+                if self.aliases is not None and name in self.aliases:
+                    continue
+                meetings_by_name.setdefault(name, set()).add(index)
+
+        clusters = []
+        for names in cluster_names(meetings_by_name, max_distance):
+            indices = set().union(*(meetings_by_name[n] for n in names))
+            meetings = [self.meetings[i] for i in sorted(indices)]
+            clusters.append(UnidentifiedCluster(
+                sorted(names, key=lambda n: (-len(meetings_by_name[n]), n)),
+                meetings,
+                sorted({group_of[id(m)] for m in meetings}),
+            ))
+        clusters.sort(key=lambda c: (-len(c.meetings), c.names[0]))
+        return clusters
+
     def get_serializable_data(self):
         """
         Pass this data back into deserialize below to re-instantiate the
-        object.
+        object. The data is columnar, so nothing is repeated per attendee:
+
+            {
+                "format": "teacherHelper.MeetingSet",
+                "version": 2,
+                "students": [student_id, ...],
+                "meetings": {               # one entry per meeting, in order
+                    "topic": [...],
+                    "datetime": [...],      # isoformat
+                    "search_confidence": [...],
+                    "unidentifiable": [[name, ...], ...],
+                    "attendees": [[student, ...], ...]
+                },
+                "groups": [[meeting, ...], ...],
+                "attendance": {             # sparse (meeting, student, ...)
+                    "meeting": [...],
+                    "student": [...],
+                    "minutes": [...],
+                    "connections": [...]
+                }
+            }
+
+        where student and meeting are indices into the students list and the
+        meetings table.
         """
         if not self.is_processed:
             raise Exception('Unprocessed MeetingSet cannot be serialized.')
-        serialized_groups = []
-        for group in self.groups:
-            serialized_meetings = []
-            for meeting in group:
-                meeting_dict = {
-                    'unidentifiable': meeting.unidentifiable,
-                    'attendees': [(s.name, s.zoom_attendance_report) for s in meeting.attendees],
-                    'datetime': meeting.datetime.isoformat(),
-                    'topic': meeting.topic,
-                    'search_confidence': meeting.SEARCH_CONFIDENCE_THRESHOLD
-                }
-                serialized_meetings.append(meeting_dict)
-            serialized_groups.append(serialized_meetings)
-        return serialized_groups
+        students = {}  # student_id: index
+        meetings = {
+            'topic': [],
+            'datetime': [],
+            'search_confidence': [],
+            'unidentifiable': [],
+            'attendees': [],
+        }
+        attendance = {
+            'meeting': [],
+            'student': [],
+            'minutes': [],
+            'connections': [],
+        }
 
-    def serialize(self):
-        return json.dumps(self.get_serializable_data())
+        def index(st):
+            return students.setdefault(st.student_id, len(students))
+
+        positions = {}  # id(meeting): index in the meetings table
+        for i, meeting in enumerate(self.meetings):
+            positions[id(meeting)] = i
+            meetings['topic'].append(meeting.topic)
+            meetings['datetime'].append(meeting.datetime.isoformat())
+            meetings['search_confidence'].append(
+                meeting.SEARCH_CONFIDENCE_THRESHOLD
+            )
+            meetings['unidentifiable'].append(meeting.unidentifiable)
+            meetings['attendees'].append([index(s) for s in meeting.attendees])
+            for st, minutes in meeting.durations.items():
+                attendance['meeting'].append(i)
+                attendance['student'].append(index(st))
+                attendance['minutes'].append(minutes)
+                attendance['connections'].append(
+                    meeting.connections.get(st, 1)
+                )
+        return {
+            'format': self.SERIALIZATION_FORMAT,
+            'version': self.SERIALIZATION_VERSION,
+            'students': list(students),
+            'meetings': meetings,
+            'groups': [
+                [positions[id(m)] for m in group] for group in self.groups
+            ],
+            'attendance': attendance,
+        }
+
+    def serialize(self, compress=False):
+        """
+        JSON string of get_serializable_data(), or gzipped JSON bytes if
+        compress is True. deserialize_from_string takes either.
+        """
+        jsonstr = json.dumps(
+            self.get_serializable_data(),
+            separators=(',', ':')
+        )
+        if compress:
+            return gzip.compress(jsonstr.encode())
+        return jsonstr
 
     @ classmethod
-    def deserialize(cls, data: list):
+    def deserialize(cls, data):
         """
         Reconstruct the class from data previously generated by the serialize
         method. The only caveat is that the original raw data is lost, but
@@ -654,21 +1182,85 @@ class MeetingSet(HelperConsumer):
         can be easily added in a subclass but for my current purposes, it would
         be a waste.
 
-        VERY DIFFICULT BUG THAT CONFUSED ME FOR A LONG TIME:
+        Data in the original format (a list of groups of meeting dicts, from
+        before serialization was versioned) can still be read.
+        """
+        if isinstance(data, list):
+            return cls._deserialize_v1(data)
+        if data.get('format') != cls.SERIALIZATION_FORMAT:
+            raise ValueError('Data is not a serialized MeetingSet.')
+        if data.get('version') != cls.SERIALIZATION_VERSION:
+            raise ValueError(
+                f'Unsupported MeetingSet serialization version: '
+                f'{data.get("version")}'
+            )
+        return cls._deserialize_v2(data)
 
-        If `cls` is instantiated after Student.zoom_attendance_report are
-        deserialized and assigned to the student class THOSE ATTENDANCE
-        REPORTS ARE ERASED! This happens because `cls.__init__()` initializes
-        the zoom attendance reports on all helper students, thus ERASING
-        all that data.
+    @ classmethod
+    def _deserialize_v2(cls, data):
+        self = cls([])
+        students = self._resolve_students(data['students'])
+
+        table = data['meetings']
+        meetings = []
+        for topic, datetime_, confidence, unidentifiable, attendees in zip(
+                table['topic'],
+                table['datetime'],
+                table['search_confidence'],
+                table['unidentifiable'],
+                table['attendees']):
+            meeting = self._serialized_meeting(
+                topic,
+                datetime_,
+                confidence,
+                unidentifiable
+            )
+            meeting.attendees = [
+                students[i] for i in attendees if students[i] is not None
+            ]
+            meetings.append(meeting)
+
+        attendance = data['attendance']
+        for i, student, minutes, connections in zip(
+                attendance['meeting'],
+                attendance['student'],
+                attendance['minutes'],
+                attendance.get('connections') or repeat(1)):
+            if (st := students[student]) is not None:
+                meetings[i].durations[st] = minutes
+                meetings[i].connections[st] = connections
+        for meeting in meetings:
+            meeting.finalize()
+            self._record_meeting(meeting)
 
-        I've since changed the __init__ method to be a bit more gentle and
-        check if a zoom_attendance_report is already there just in case, but
-        that was a nasty, nasty bug.
+        self.is_processed = True
+        self.meetings = meetings
+        self.groups = [[meetings[i] for i in group] for group in data['groups']]
+        self._grouping_index = None
+        self._report_missing_students()
+        return self
+
+    @ classmethod
+    def _deserialize_v1(cls, data: list):
+        """
+        Attendance goes into the new set's AttendanceStore once every
+        meeting has its column, because each attendee carries their report
+        for all meetings, not just the one they are listed under.
+
+        This format only has names; they are looked up as student_ids,
+        which only differ from names for students with the same name.
         """
         self = cls([])
         groups = []
         all_meetings = []
+        reports = {}  # student_id: serialized zoom_attendance_report
+        names = sorted({
+            name
+            for group in data
+            for meeting_dict in group
+            for name, _ in meeting_dict['attendees']
+        })
+        students = dict(zip(names, self._resolve_students(names)))
 
         # for each group
         for serialized_group in data:
@@ -679,12 +1271,10 @@ class MeetingSet(HelperConsumer):
                 unidentifiable = meeting_dict['unidentifiable']
                 attendees = []
 
-                # students should always match since names have been cleaned.
                 for st_name, st_zar in meeting_dict['attendees']:
-                    st = self.helper.find_nearest_match(st_name, auto_yes=True)
-                    if not st:
-                        raise Exception('unexpected no st')
-                    st.zoom_attendance_report = st_zar
+                    if (st := students[st_name]) is None:
+                        continue
+                    reports.setdefault(st.student_id, st_zar)
                     attendees.append(st)
 
                 # reconstruct meeting object
@@ -696,23 +1286,259 @@ class MeetingSet(HelperConsumer):
                 )
                 meeting.unidentifiable = unidentifiable
                 meeting.attendees = attendees
-
+                self.attendance.add_meeting(meeting)
 
                 # make appends to reconstruct MeetingSet later
                 group_meetings.append(meeting)
                 all_meetings.append(meeting)
             groups.append(group_meetings)
 
+        # fill in attendance, then give meetings their durations back
+        for student_id, st_zar in reports.items():
+            for key, duration in st_zar.items():
+                if (column := self.attendance.meeting_columns.get(key)) is not None:
+                    self.attendance.record(student_id, column, duration)
+        for meeting in all_meetings:
+            student_ids, durations = self.attendance.meeting_attendance(
+                self.attendance.meeting_columns[str(meeting)]
+            )
+            meeting.durations = {
+                self.helper.students[i]: int(d)
+                for i, d in zip(student_ids, durations)
+            }
+            self._link_students(meeting)
+            # this format didn't record reconnections
+            meeting.connections = dict.fromkeys(meeting.durations, 1)
+            meeting.finalize()
+
         # reconstruct MeetingSet
         self.is_processed = True  # it is illegal to serialize unprocessed meetingsets.
         self.groups = groups
         self.meetings = all_meetings
+        self._grouping_index = None
+        self._report_missing_students()
         return self
 
+    def _resolve_students(self, student_ids):
+        """
+        Students for serialized student_ids, by exact lookup in the roster.
+        Ids that are no longer in the roster come back as None, and are
+        reported in self.missing_students, rather than being matched to
+        whoever has the closest name.
+        """
+        students = [self.helper.students.get(i) for i in student_ids]
+        self.missing_students.extend(
+            i for i, st in zip(student_ids, students) if st is None
+        )
+        return students
+
+    def _report_missing_students(self):
+        if self.missing_students:
+            logger.warning(
+                '%(n)d students in the serialized MeetingSet are not in the '
+                'roster, and were left out: %(missing)s',
+                {
+                    'n': len(self.missing_students),
+                    'missing': ', '.join(self.missing_students)
+                }
+            )
+
     @ staticmethod
-    def deserialize_from_string(jsonstr: str):
+    def deserialize_from_string(jsonstr):
+        """
+        Takes the output of serialize: a JSON string, or gzipped JSON bytes.
+        """
+        if isinstance(jsonstr, bytes):
+            jsonstr = gzip.decompress(jsonstr)
         return MeetingSet.deserialize(json.loads(jsonstr))
 
+    @ staticmethod
+    def _serialized_meeting(topic, datetime_, search_confidence, unidentifiable):
+        meeting = Meeting(None)
+        meeting.SEARCH_CONFIDENCE_THRESHOLD = search_confidence
+        meeting.topic = topic
+        meeting.datetime = datetime.datetime.fromisoformat(datetime_)
+        meeting.unidentifiable = unidentifiable
+        return meeting
+
+    def dump(self, fp):
+        """
+        Write the MeetingSet to a text file as JSON Lines, one meeting at a
+        time, so that only one meeting is ever held as JSON. The first line
+        is a header like the one in get_serializable_data, then each line is
+        a meeting:
+
+            {
+                "group": index in self.groups,
+                "topic": ..., "datetime": ..., "search_confidence": ...,
+                "unidentifiable": [name, ...],
+                "students": [student_id, ...],  # first seen in this meeting
+                "attendees": [student, ...],
+                "attendance": [[student, minutes, connections], ...]
+            }
+
+        where student is an index into all the "students" lists so far, in
+        order. Meetings are written in the order of self.meetings. For a
+        compressed file, pass in a file from gzip.open(path, 'wt').
+        """
+        if not self.is_processed:
+            raise Exception('Unprocessed MeetingSet cannot be serialized.')
+        group_indices = {
+            id(m): i for i, group in enumerate(self.groups) for m in group
+        }
+        students = {}  # student_id: index
+
+        def write(record):
+            fp.write(json.dumps(record, separators=(',', ':')))
+            fp.write('\n')
+
+        def index(st, new_students):
+            if st.student_id not in students:
+                students[st.student_id] = len(students)
+                new_students.append(st.student_id)
+            return students[st.student_id]
+
+        write({
+            'format': self.SERIALIZATION_FORMAT,
+            'version': self.SERIALIZATION_VERSION,
+        })
+        for meeting in self.meetings:
+            new_students = []
+            attendees = [index(st, new_students) for st in meeting.attendees]
+            attendance = [
+                [index(st, new_students), d, meeting.connections.get(st, 1)]
+                for st, d in meeting.durations.items()
+            ]
+            write({
+                'group': group_indices[id(meeting)],
+                'topic': meeting.topic,
+                'datetime': meeting.datetime.isoformat(),
+                'search_confidence': meeting.SEARCH_CONFIDENCE_THRESHOLD,
+                'unidentifiable': meeting.unidentifiable,
+                'students': new_students,
+                'attendees': attendees,
+                'attendance': attendance,
+            })
+
+    @ classmethod
+    def load(cls, fp):
+        """
+        Read a MeetingSet written by dump, one line at a time. Like
+        deserialize, students are looked up by exact student_id, and those
+        that are no longer in the roster are listed in
+        self.missing_students.
+        """
+        header = json.loads(fp.readline() or '{}')
+        if header.get('format') != cls.SERIALIZATION_FORMAT:
+            raise ValueError('File is not a dumped MeetingSet.')
+        if header.get('version') != cls.SERIALIZATION_VERSION:
+            raise ValueError(
+                f'Unsupported MeetingSet serialization version: '
+                f'{header.get("version")}'
+            )
+        self = cls([])
+        students = []
+        for line in fp:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            students.extend(self._resolve_students(record['students']))
+            meeting = self._serialized_meeting(
+                record['topic'],
+                record['datetime'],
+                record['search_confidence'],
+                record['unidentifiable']
+            )
+            meeting.attendees = [
+                students[i] for i in record['attendees']
+                if students[i] is not None
+            ]
+            for i, minutes, connections in record['attendance']:
+                if (st := students[i]) is not None:
+                    meeting.durations[st] = minutes
+                    meeting.connections[st] = connections
+            meeting.finalize()
+            self._record_meeting(meeting)
+            self.meetings.append(meeting)
+            while len(self.groups) <= record['group']:
+                self.groups.append([])
+            self.groups[record['group']].append(meeting)
+
+        self.is_processed = True
+        self._report_missing_students()
+        return self
+
+
+class ReportStyles:
+    """
+    Registry of the styles used in the excel report, by name. Each style is
+    added to the workbook once, as an openpyxl NamedStyle, and cells refer
+    to it by name (cell.style = 'header'), so openpyxl doesn't build, hash,
+    and look up a new Font and PatternFill for every cell it writes.
+
+    With named=False, cells are given the style's font and fill
+    instead, which is how the report was styled before there was a
+    registry.
+    """
+
+    COLORS = {
+        'green': '18fc03',
+        'yellow': 'fcf403',
+        'red': 'fc0303',
+    }
+
+    # name: (font, fill color)
+    STYLES = {
+        'report title': (Font(size=30, bold=True, name='Cambria'), None),
+        'key title': (Font(size=16, name='Calibri'), None),
+        'sheet title': (Font(size=32, bold=True), None),
+        'section title': (Font(size=24, bold=True), None),
+        'section subtitle': (Font(size=24, italic=True), None),
+        'header': (Font(bold=True), None),
+        'name cell': (Font(size=16), None),
+        'green': (None, 'green'),
+        'yellow': (None, 'yellow'),
+        'red': (None, 'red'),
+        'green duration': (Font(size=16), 'green'),
+        'yellow duration': (Font(size=16), 'yellow'),
+        'red duration': (Font(size=16), 'red'),
+    }
+
+    def __init__(self, workbook, named=True):
+        self.workbook = workbook
+        self.named = named
+        self.fonts = {}
+        self.fills = {}
+        for name, (font, color) in self.STYLES.items():
+            if font:
+                self.fonts[name] = font
+            if color:
+                self.fills[name] = self.fill(color)
+            if named and name not in workbook.named_styles:
+                style = NamedStyle(name=name)
+                if font:
+                    style.font = font
+                if color:
+                    style.fill = self.fills[name]
+                workbook.add_named_style(style)
+
+    @classmethod
+    def fill(cls, color):
+        code = cls.COLORS[color]
+        return PatternFill(fill_type='solid', start_color=code, end_color=code)
+
+    def apply(self, cell, name):
+        """
+        Style cell (a worksheet cell or WriteOnlyCell) with the style called
+        name.
+        """
+        if self.named:
+            cell.style = name
+            return
+        if name in self.fonts:
+            cell.font = self.fonts[name]
+        if name in self.fills:
+            cell.fill = self.fills[name]
 
 
 class DynamicDateColorer:
@@ -722,6 +1548,9 @@ class DynamicDateColorer:
 
     Thresholds can be easily changed by modifying the constants in init, and
     extensibility to allow for custom thresholds is definitely a possibility.
+
+    get_color_name gives the name of the color ('green', 'yellow', or
+    'red'), which is also the name of its style in ReportStyles.
     """
 
     def __init__(self, *a, **kw):
@@ -732,37 +1561,31 @@ class DynamicDateColorer:
         self._45_MIN_GREEN = 40
         self._45_MIN_YELLOW = 30
 
-        def fill(colorcode):
-            return PatternFill(
-                fill_type='solid',
-                start_color=colorcode,
-                end_color=colorcode
-            )
-
         self.colors = {
-            'green': fill('18fc03'),
-            'yellow': fill('fcf403'),
-            'red': fill('fc0303'),
+            color: ReportStyles.fill(color) for color in ReportStyles.COLORS
         }
 
     def get_color(self, duration: int, timestamp: int):
+        return self.colors[self.get_color_name(duration, timestamp)]
+
+    def get_color_name(self, duration: int, timestamp: int):
         if timestamp < self.OCTOBER_4_2020:
             return self._30_min_class_color(duration)
         return self._45_min_class_color(duration)
 
     def _30_min_class_color(self, duration):
         if duration > self._30_MIN_GREEN:
-            return self.colors.get('green')
+            return 'green'
         if duration > self._30_MIN_YELLOW:
-            return self.colors.get('yellow')
-        return self.colors.get('red')
+            return 'yellow'
+        return 'red'
 
     def _45_min_class_color(self, duration):
         if duration > self._45_MIN_GREEN:
-            return self.colors.get('green')
+            return 'green'
         if duration > self._45_MIN_YELLOW:
-            return self.colors.get('yellow')
-        return self.colors.get('red')
+            return 'yellow'
+        return 'red'
 
     def get_color_avg(self, duration):
         if duration > 30:
@@ -802,14 +1625,33 @@ class WorkbookWriter:
 
     Raw Data Sheet:
         Simple view of the unsorted raw data.
+
+    With write_only=True, the workbook is an openpyxl write-only workbook:
+    each sheet writer streams its rows out in order as it goes, instead of
+    keeping a cell object for every cell in memory until the workbook is
+    saved. A write-only workbook can only be saved once, and its sheets
+    can't be read back.
+
+    Cells are styled by name from one ReportStyles registry, shared by all
+    of the sheet writers. named_styles=False styles each cell with its own
+    font and fill instead.
     """
 
-    def __init__(self, meeting_set: MeetingSet, *a, **kw):
+    def __init__(
+            self,
+            meeting_set: MeetingSet,
+            *a,
+            write_only=False,
+            named_styles=True,
+            **kw):
         self.meeting_set = meeting_set
+        self.write_only = write_only
 
         # init workbook
-        self.workbook = Workbook()
-        self.workbook.remove(self.workbook.active)
+        self.workbook = Workbook(write_only=write_only)
+        if not write_only:
+            self.workbook.remove(self.workbook.active)
+        self.styles = ReportStyles(self.workbook, named=named_styles)
 
         # sheet writer classes do the heavy lifting.
         self.sheet_writer_classes = [
@@ -826,8 +1668,13 @@ class WorkbookWriter:
         # write sheets
         for SheetWriter in self.sheet_writer_classes:
             logger.info(f'Writing with SheetWriter class: {SheetWriter}')
-            wr = SheetWriter(self.meeting_set, self.workbook.create_sheet())
+            wr = SheetWriter(
+                self.meeting_set,
+                self.workbook.create_sheet(),
+                styles=self.styles
+            )
             wr.write_sheet()
+            wr.flush()
 
         return self.workbook
 
@@ -838,15 +1685,24 @@ class BaseSheetWriter(DynamicDateColorer):
             meeting_set: MeetingSet,
             sheet,
             start_row=1,
-            title='Sheet'
+            title='Sheet',
+            styles=None
     ):
         super().__init__()
         self.meeting_set = meeting_set
         self.sheet = sheet
+        self.styles = styles or ReportStyles(sheet.parent)
         self.groups = meeting_set.groups
         self.sheet.title = title
         self.cur_row = start_row
 
+        # in a write-only sheet, cells are kept until their row is done, and
+        # then the row is appended to the sheet.
+        self.write_only = not hasattr(sheet, 'cell')
+        self._buffered_row = None
+        self._buffered_cells = {}   # column: WriteOnlyCell
+        self._rows_written = 0
+
     def write_sheet(self):
         """
         Write data into the sheet provided to init.
@@ -854,22 +1710,70 @@ class BaseSheetWriter(DynamicDateColorer):
         raise NotImplementedError
 
     def write_cell(self, *,
-                   value: str, row=None, col: int, font=None, fill=None
+                   value: str, row=None, col: int, style=None, font=None,
+                   fill=None
                    ):
         """
         Utility for writing to a single cell with styles. Does not incremenet
-        self.cur_row.
+        self.cur_row. style is the name of a style in ReportStyles; font and
+        fill, if given, are applied on top of it.
 
         All positional args are captured for clarity. Use keyword args only.
         """
         row = row if row else self.cur_row          # override default row value
+        if self.write_only:
+            self._buffer_cell(row, col, value, style, font, fill)
+            return
         cell = self.sheet.cell(row=row, column=col)  # select column
         cell.value = value                          # write value
+        if style:                                   # set named style
+            self.styles.apply(cell, style)
         if font:                                    # set font
             cell.font = font
         if fill:                                    # set fill
             cell.fill = fill
 
+    def _buffer_cell(self, row, col, value, style, font, fill):
+        """
+        write_cell for write-only sheets, where rows have to be written in
+        order. Writing to a later row flushes the current one.
+        """
+        if row != self._buffered_row:
+            if row <= self._rows_written or (
+                    self._buffered_row is not None and row < self._buffered_row):
+                raise ValueError(
+                    f'Cannot write to row {row} of write-only sheet '
+                    f'"{self.sheet.title}" after a later row.'
+                )
+            self.flush()
+            self._buffered_row = row
+        cell = WriteOnlyCell(self.sheet, value=value)
+        if style:
+            self.styles.apply(cell, style)
+        if font:
+            cell.font = font
+        if fill:
+            cell.fill = fill
+        self._buffered_cells[col] = cell
+
+    def flush(self):
+        """
+        Append the buffered row of a write-only sheet, after blank rows for
+        any that were skipped. Called by WorkbookWriter after write_sheet.
+        """
+        if self._buffered_row is None:
+            return
+        while self._rows_written < self._buffered_row - 1:
+            self.sheet.append([])
+            self._rows_written += 1
+        self.sheet.append([
+            self._buffered_cells.get(col)
+            for col in range(1, max(self._buffered_cells) + 1)
+        ])
+        self._rows_written += 1
+        self._buffered_row = None
+        self._buffered_cells = {}
+
 
 class MainSheetWriter(BaseSheetWriter):
     """
@@ -921,34 +1825,42 @@ class MainSheetWriter(BaseSheetWriter):
         document.
         """
         # header information
-        a1 = self.sheet['A1']
-        a1.value = self.sheet.title
-        a1.font = Font(size=30, bold=True, name='Cambria')
-        b1 = self.sheet['A2']
-        b1.value = 'Key'
-        b1.font = Font(size=16, name='Calibri')
-
-        # fill in key
-        b2, c2 = self.sheet['A3':'B3'][0]
-        b2.fill = self.colors['green']
-        c2.value = (
-            f'Green: Student attended for at least {self._30_MIN_GREEN} '
-            f'minutes before 10/4/2020, or {self._45_MIN_GREEN} after '
-            '10/4/2020.'
-        )
-        b3, c3 = self.sheet['A4':'B4'][0]
-        b3.fill = self.colors['yellow']
-        c3.value = (
-            f'Yellow: Student attended for at least {self._30_MIN_YELLOW} '
-            f'minutes before 10/4/2020, or {self._45_MIN_GREEN} after '
-            '10/4/2020.'
+        self.write_cell(
+            row=1,
+            col=1,
+            value=self.sheet.title,
+            style='report title'
         )
-        b4, c4 = self.sheet['A5':'B5'][0]
-        b4.fill = self.colors['red']
-        c4.value = (
-            f'Red: Student attended for less than {self._30_MIN_YELLOW} before '
-            f' 10/4/2020, or {self._45_MIN_YELLOW} after 10/4/2020.'
+        self.write_cell(
+            row=2,
+            col=1,
+            value='Key',
+            style='key title'
         )
+
+        # fill in key
+        key = [
+            (
+                'green',
+                f'Green: Student attended for at least {self._30_MIN_GREEN} '
+                f'minutes before 10/4/2020, or {self._45_MIN_GREEN} after '
+                '10/4/2020.'
+            ),
+            (
+                'yellow',
+                f'Yellow: Student attended for at least {self._30_MIN_YELLOW} '
+                f'minutes before 10/4/2020, or {self._45_MIN_GREEN} after '
+                '10/4/2020.'
+            ),
+            (
+                'red',
+                f'Red: Student attended for less than {self._30_MIN_YELLOW} before '
+                f' 10/4/2020, or {self._45_MIN_YELLOW} after 10/4/2020.'
+            ),
+        ]
+        for row, (color, explanation) in enumerate(key, start=3):
+            self.write_cell(row=row, col=1, value=None, style=color)
+            self.write_cell(row=row, col=2, value=explanation)
         self.cur_row += 5
 
     def _explain_dynamic_groupings(self):
@@ -989,7 +1901,7 @@ class MainSheetWriter(BaseSheetWriter):
         self.write_cell(
             col=1,
             value=f'Dynamic Group{s}',
-            font=Font(size=32, bold=True)
+            style='sheet title'
         )
         self.cur_row += 1
 
@@ -998,7 +1910,7 @@ class MainSheetWriter(BaseSheetWriter):
             value=(
                 f'Group contains meet topic{s}: {group_topics}'
             ),
-            font=Font(size=24, italic=True)
+            style='section subtitle'
         )
         self.cur_row += 1
 
@@ -1013,7 +1925,8 @@ class MainSheetWriter(BaseSheetWriter):
             'Meetings at the point of writing headers\n '
             + '\n'.join([str(i) for i in self.cur_meetings])
         )
-        self.cur_meetings.sort(key=lambda m: m.datetime)
+        # sorted copy; sorting in place would reorder MeetingSet.groups
+        self.cur_meetings = sorted(self.cur_meetings, key=lambda m: m.datetime)
         self.cur_headers = [m.__str__() for m in self.cur_meetings]
         # logger.debug(f'Headers assigned: {self.cur_headers}')
         write_headers = ['Last Name', 'First Name'] + self.cur_headers
@@ -1022,7 +1935,7 @@ class MainSheetWriter(BaseSheetWriter):
             self.write_cell(
                 col=i,
                 value=topic,
-                font=Font(bold=True)
+                style='header'
             )
         self.cur_row += 1
 
@@ -1039,7 +1952,7 @@ class MainSheetWriter(BaseSheetWriter):
                 self.write_cell(
                     col=i + 1,
                     value=name,
-                    font=Font(size=16)
+                    style='name cell'
                 )
 
             # iterate over headers to fill in row
@@ -1049,17 +1962,19 @@ class MainSheetWriter(BaseSheetWriter):
                 i += 3  # offset for first and last name
 
                 # select value
-                if not (mins_attended := student.zoom_attendance_report.get(header)):
-                    mins_attended = 0
+                mins_attended = self.meeting_set.attendance.get(
+                    student.student_id,
+                    header
+                )
 
+                color = self.get_color_name(
+                    mins_attended,
+                    self.name_to_meeting_map[header].datetime.timestamp()
+                )
                 self.write_cell(
                     col=i,
                     value=mins_attended,
-                    fill=self.get_color(
-                        mins_attended,
-                        self.name_to_meeting_map[header].datetime.timestamp()
-                    ),
-                    font=Font(size=16)
+                    style=f'{color} duration'
                 )
             self.cur_row += 1
 
@@ -1083,22 +1998,14 @@ class HomeroomSummaryWriter(MainSheetWriter, HelperConsumer):
             self.cur_homeroom = homeroom
             self.cur_group_students = homeroom.students
 
-            # homeroom_meeting_set will the set of meetings that students in
-            # the homeroom went to
-            homeroom_meeting_set = set()
-            for st in homeroom.students:
-
-                logger.debug(f'{st.name} has been to meetings: {st.zoom_attendance_report}')
-
-                # update cur_meetings with all the meetings this student went
-                # to
-                homeroom_meeting_set.update([
-                    m for m in st.zoom_attendance_report  # dict keys
-                ])
-
-            # convert set to list for compatibility with parent classs
+            # the meetings that any student in the homeroom went to
+            attendance = self.meeting_set.attendance
+            columns = attendance.columns_attended(
+                [st.student_id for st in homeroom.students]
+            )
             self.cur_meetings = [
-                self.name_to_meeting_map[n] for n in homeroom_meeting_set
+                self.name_to_meeting_map[attendance.meeting_keys[c]]
+                for c in columns
             ]
             logger.debug(f'Homeroom\'s meetings before writing: {self.cur_meetings}')
 
@@ -1114,7 +2021,7 @@ class HomeroomSummaryWriter(MainSheetWriter, HelperConsumer):
                 f'{self.cur_homeroom.teacher}, Grade '
                 + str(self.cur_homeroom.grade_level)
             ),
-            font=Font(size=24, bold=True)
+            style='section title'
         )
         self.cur_row += 1
 
@@ -1125,7 +2032,7 @@ class HomeroomSummaryWriter(MainSheetWriter, HelperConsumer):
                 f'{self.cur_homeroom.teacher}, Grade '
                 + self.cur_homeroom.grade_level
             ),
-            font=Font(size=24, bold=True)
+            style='section title'
         )
 
     def _sorted_homerooms(self):
@@ -1142,42 +2049,30 @@ class HighlightSheetWriter(BaseSheetWriter):
 
     def __init__(self, *a, **kw):
         super().__init__(*a, **kw, title='Highlights')
+        self.analytics = AttendanceAnalytics(self.meeting_set)
 
     def write_sheet(self):
         self._write_sheet_header()
         self._write_missing_students()
-
-        # Placeholder message on charts
-        self.cur_row += 3
-        data = [
-            'I\'m thinking about adding charts, but I want to keep things '
-            'simple. If you think charts would be really useful to you, '
-            'send me an email at jdevries@empacad.org and I\'ll look '
-            'into it further.',
-            'For example, charts of average attendance '
-            'over time, standard devition in attendance duration over time '
-            '(basically, consistency across the class), etc.'
-        ]
-        for row in data:
-            self.write_cell(
-                col=1,
-                value=row,
-                font=Font(size=16, italic=True)
-            )
-            self.cur_row += 1
+        self.cur_row += 1
+        self._write_top_and_bottom_students()
+        self.cur_row += 1
+        self._write_group_attendance()
+        self.cur_row += 1
+        self._write_consistency_over_time()
 
     def _write_sheet_header(self):
         self.write_cell(
             value='Highlights',
             col=1,
-            font=Font(size=32, bold=True),
+            style='sheet title',
         )
         self.cur_row += 2
 
         self.write_cell(
             value='Unmatched Names',
             col=1,
-            font=Font(size=24, bold=True)
+            style='section title'
         )
         self.cur_row += 1
 
@@ -1217,11 +2112,13 @@ class HighlightSheetWriter(BaseSheetWriter):
                 col=1,
                 value="All students were matched. No missing students"
             )
+            self.cur_row += 2
             return
         start_block = copy(self.cur_row)
         cur_col = 1
         n = len(unidentifiable) // 10
         n = n if n > 1 else 1
+        block = {}  # row: [(column, name)]
         for i, name in enumerate(unidentifiable):
             i += 1
             # every n rows, move one column over and fill the same row range
@@ -1231,16 +2128,150 @@ class HighlightSheetWriter(BaseSheetWriter):
                 self.cur_row = copy(start_block)
 
             self.cur_row += 1
+            block.setdefault(self.cur_row, []).append((cur_col, name))
 
-            # write name to current cell
-            self.write_cell(
-                row=self.cur_row,
-                col=cur_col,
-                value=name
-            )
+        # write names row by row, so that write-only sheets work too
+        for row in sorted(block):
+            for col, name in block[row]:
+                self.write_cell(
+                    row=row,
+                    col=col,
+                    value=name
+                )
 
         # cleanup; set cur_row to two rows after the end of the name block
-        self.cur_row += start_block + n + 2
+        self.cur_row = start_block + n + 2
+
+    def _write_section(self, title, description, headers):
+        self.write_cell(
+            value=title,
+            col=1,
+            style='section title'
+        )
+        self.cur_row += 1
+        self.write_cell(value=description, col=1)
+        self.cur_row += 1
+        self._write_table_row(headers, style='header')
+
+    def _write_table_row(self, values, style=None):
+        for i, value in enumerate(values):
+            self.write_cell(col=i + 1, value=value, style=style)
+        self.cur_row += 1
+
+    def _write_top_and_bottom_students(self):
+        """
+        Students in the top and bottom 10th percentile of total minutes
+        across all groups.
+        """
+        headers = [
+            'Last Name',
+            'First Name',
+            'Homeroom',
+            'Total Minutes',
+            'Meetings Attended',
+            'Average Minutes',
+            'Median Minutes',
+        ]
+        rows = self.analytics.store.student_rows
+        students = self.meeting_set.helper.students
+        for title, which, student_ids in (
+            ('Most Attendance', 'top', self.analytics.top_students()),
+            ('Least Attendance', 'bottom', self.analytics.bottom_students()),
+        ):
+            self._write_section(
+                title,
+                (
+                    f'Students in the {which} 10th percentile of total minutes '
+                    'in zoom meetings, across all groups.'
+                ),
+                headers
+            )
+            for student_id in student_ids:
+                st = students[student_id]
+                row = rows[student_id]
+                self._write_table_row([
+                    st.last_name,
+                    st.first_name,
+                    st.homeroom,
+                    int(self.analytics.totals[row]),
+                    int(self.analytics.meetings_attended[row]),
+                    round(float(self.analytics.means[row]), 1),
+                    float(self.analytics.medians[row]),
+                ])
+            self.cur_row += 1
+
+    def _write_group_attendance(self):
+        """
+        Attendance of each dynamic group, against the most students that
+        were ever at one of its meetings.
+        """
+        self._write_section(
+            'Attendance by Dynamic Group',
+            (
+                'The real size of each group is unknown, so attendance rate '
+                'is the average attendance as a percentage of the most '
+                'students that were ever at one of the group\'s meetings.'
+            ),
+            [
+                'Group',
+                'Topics',
+                'Meetings',
+                'Most Students at Once',
+                'Attendance Rate',
+                'Average Minutes',
+                '',
+            ]
+        )
+        best, worst = self.analytics.best_and_worst_groups()
+        for summary in self.analytics.group_summaries():
+            # summaries are rebuilt on each call, so compare by group index
+            note, style = '', None
+            if best.index != worst.index and summary.index == best.index:
+                note, style = 'Best attendance', 'green'
+            elif best.index != worst.index and summary.index == worst.index:
+                note, style = 'Worst attendance', 'red'
+            self._write_table_row([
+                summary.index + 1,
+                ', '.join(summary.topics),
+                summary.meetings,
+                summary.historical_max,
+                f'{summary.attendance_rate:.0%}',
+                round(summary.mean_minutes, 1),
+                note,
+            ], style=style)
+
+    def _write_consistency_over_time(self):
+        """
+        Average and standard deviation of minutes at each meeting of each
+        group. A low standard deviation means the class stayed for about
+        the same amount of time.
+        """
+        self._write_section(
+            'Consistency Over Time',
+            (
+                'For each meeting: how many students came, how long they '
+                'stayed on average, and the standard deviation of how long '
+                'they stayed (lower is more consistent across the class).'
+            ),
+            [
+                'Group',
+                'Date',
+                'Topic',
+                'Attendance',
+                'Average Minutes',
+                'Standard Deviation',
+            ]
+        )
+        for i in range(len(self.groups)):
+            for meeting, attendance, mean, std in self.analytics.over_time(i):
+                self._write_table_row([
+                    i + 1,
+                    str(meeting.datetime.date()),
+                    meeting.topic,
+                    attendance,
+                    round(mean, 1),
+                    round(std, 1),
+                ])
 
 class RawDataWriter(BaseSheetWriter):
     def __init__(self, *a, **kw):
@@ -1272,22 +2303,21 @@ class RawDataWriter(BaseSheetWriter):
         self.cur_row += 1
 
     def _write_data(self):
+        attendance = self.meeting_set.attendance
         for meeting in self.meeting_set.meetings:
             for st in meeting.attendees:
-                for k, v in st.zoom_attendance_report.items():
-                    meeting = self.name_to_meeting[k]
-                    data = [
-                        st.last_name,
-                        st.first_name,
-                        st.homeroom,
-                        meeting.topic,
-                        str(meeting.datetime.date()),
-                        meeting.datetime.strftime('%H %M'),
-                        v
-                    ]
-                    for i, d in enumerate(data):
-                        self.write_cell(
-                            col=i + 1,
-                            value=d,
-                        )
-                    self.cur_row += 1
+                data = [
+                    st.last_name,
+                    st.first_name,
+                    st.homeroom,
+                    meeting.topic,
+                    str(meeting.datetime.date()),
+                    meeting.datetime.strftime('%H %M'),
+                    attendance.get(st.student_id, meeting)
+                ]
+                for i, d in enumerate(data):
+                    self.write_cell(
+                        col=i + 1,
+                        value=d,
+                    )
+                self.cur_row += 1